@@ -10,8 +10,9 @@ PyPunisher provides two metrics: the Akaike and Bayesian Information
 Criterion, both of which punish complex models.
 """
 
-from pypunisher.metrics.criterion import aic, bic
+from pypunisher.metrics.criterion import aic, bic, aic_batch, bic_batch
 from pypunisher.selection_engines.selection import Selection
+from pypunisher.selection_engines.path import SelectionPath
 
 __version_info__ = (4, 0, 1)
 __version__ = '.'.join(map(str, __version_info__))
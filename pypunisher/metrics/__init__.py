@@ -8,4 +8,4 @@ Provides two metrics for measuring relative model quality:
     2. Bayesian Information Criterion (BIC)
 """
 
-from pypunisher.metrics.criterion import aic, bic
+from pypunisher.metrics.criterion import aic, bic, aic_batch, bic_batch
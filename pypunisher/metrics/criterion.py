@@ -5,9 +5,68 @@
  =====================
 """
 
+import numpy as np
 from numpy import log, ndarray, pi
 from pypunisher._checks import model_check
 
+
+def _llf_from_rss(rss, n):
+    """
+    Maximized log likelihood of a Gaussian linear model.
+
+    Args:
+        rss : float or ndarray
+            Residual sum(s) of squares.
+        n : int
+            Number of samples.
+
+    Returns:
+        llf : float or ndarray
+            Log likelihood, one per element of `rss`.
+    """
+    return -(n / 2) * log(2 * pi) - (n / 2) * log(rss / n) - n / 2
+
+
+def _aic_from_rss(rss, n, k):
+    """
+    Vectorized AIC (or AICc, if n/k < 40) computed from
+    residual sums of squares.
+
+    Args:
+        rss : float or ndarray
+            Residual sum(s) of squares.
+        n : int
+            Number of samples.
+        k : int or ndarray
+            Number of features, one per element of `rss`.
+
+    Returns:
+        aic : float or ndarray
+    """
+    k = np.asarray(k, dtype=float)
+    aic = -2 * _llf_from_rss(rss, n) + 2 * k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correction = 2 * k * (k + 1) / (n - k - 1)
+    return np.where(n / k < 40, aic + correction, aic)
+
+
+def _bic_from_rss(rss, n, k):
+    """
+    Vectorized BIC computed from residual sums of squares.
+
+    Args:
+        rss : float or ndarray
+            Residual sum(s) of squares.
+        n : int
+            Number of samples.
+        k : int or ndarray
+            Number of features, one per element of `rss`.
+
+    Returns:
+        bic : float or ndarray
+    """
+    return -2 * _llf_from_rss(rss, n) + log(n) * np.asarray(k, dtype=float)
+
 def _get_coeffs(model, X_train, y_train):
     """
     Helper function that returns appropriate coefficients
@@ -33,8 +92,8 @@ def _get_coeffs(model, X_train, y_train):
     n = X_train.shape[0]
     k = X_train.shape[1]
     y_pred = model.predict(X_train)
-    rss = sum((y_train - y_pred) ** 2)
-    llf = -(n / 2) * log(2 * pi) - (n / 2) * log(rss / n) - n / 2
+    rss = ((y_train - y_pred) ** 2).sum()
+    llf = _llf_from_rss(rss, n)
     return n, k, llf
 
 
@@ -116,3 +175,91 @@ def bic(model, X_train, y_train):
     bic = -2 * llf + log(n) * k
 
     return bic
+
+
+def _batch_rss(y_true, y_pred, rss, n):
+    """
+    Helper function that validates the inputs of the batch
+    criteria and returns residual sums of squares.
+
+    Args:
+        y_true : 1d ndarray or None
+            The response variable.
+        y_pred : 2d ndarray or None
+            Predictions, one model per column.
+        rss : 1d ndarray or None
+            Residual sums of squares, one per model.
+        n : int or None
+            Number of samples.
+
+    Returns:
+        rss : 1d ndarray
+            Residual sum of squares of each model.
+        n : int
+            Number of samples
+    """
+    if (y_pred is None) == (rss is None):
+        raise TypeError("Exactly one of `y_pred` and `rss` must be given.")
+
+    if rss is not None:
+        if not isinstance(rss, ndarray):
+            raise TypeError("`rss` must be an ndarray.")
+        if not isinstance(n, int):
+            raise TypeError("`n` must be an int when passing `rss`.")
+        return rss.astype(float, copy=False), n
+
+    if not isinstance(y_true, ndarray):
+        raise TypeError("`y_true` must be an ndarray.")
+    if not isinstance(y_pred, ndarray) or y_pred.ndim != 2:
+        raise TypeError("`y_pred` must be a 2d ndarray.")
+    residuals = y_true[:, np.newaxis] - y_pred
+    return np.einsum('ij,ij->j', residuals, residuals), y_pred.shape[0]
+
+
+def aic_batch(k, y_true=None, y_pred=None, rss=None, n=None):
+    """
+    Compute the Akaike Information Criterion (AIC) of many models at once.
+
+    Equivalent to calling ``aic()`` on each model, but computed in a
+    single vectorized pass. Pass either the models' predictions
+    (`y_true` and `y_pred`) or their residual sums of squares
+    (`rss` and `n`).
+
+    Args:
+        k (int or 1d ndarray): the number of features of each model.
+        y_true (1d ndarray): the response variable.
+        y_pred (2d ndarray): predictions of shape (observations, models).
+        rss (1d ndarray): residual sum of squares of each model.
+        n (int): the number of observations, if passing `rss`.
+
+    Returns:
+        aic (1d ndarray)
+            AIC value of each model. As in ``aic()``, AICc is
+            returned for models where n/k < 40.
+    """
+    rss, n = _batch_rss(y_true, y_pred=y_pred, rss=rss, n=n)
+    return _aic_from_rss(rss, n=n, k=np.broadcast_to(k, rss.shape))
+
+
+def bic_batch(k, y_true=None, y_pred=None, rss=None, n=None):
+    """
+    Compute the Bayesian Information Criterion (BIC) of many models at once.
+
+    Equivalent to calling ``bic()`` on each model, but computed in a
+    single vectorized pass. Pass either the models' predictions
+    (`y_true` and `y_pred`) or their residual sums of squares
+    (`rss` and `n`).
+
+    Args:
+        k (int or 1d ndarray): the number of features of each model.
+        y_true (1d ndarray): the response variable.
+        y_pred (2d ndarray): predictions of shape (observations, models).
+        rss (1d ndarray): residual sum of squares of each model.
+        n (int): the number of observations, if passing `rss`.
+
+    Returns:
+        bic (1d ndarray)
+            BIC value of each model.
+    """
+    rss, n = _batch_rss(y_true, y_pred=y_pred, rss=rss, n=n)
+    return _bic_from_rss(rss, n=n, k=np.broadcast_to(k, rss.shape))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""
+Column Buffers
+==============
+"""
+import numpy as np
+
+
+class ColumnBuffer(object):
+    """Fortran-ordered working copies of one or more matrices
+    which share a column permutation.
+
+    Candidate feature sets are gathered by swapping columns so that the
+    requested features occupy the leading columns of the buffer, in the
+    order requested. The candidate matrix is then the view ``X[:, :k]``,
+    which is contiguous, rather than a fresh copy from fancy indexing, and
+    holds exactly the columns of ``X[:, features]``, so that estimators
+    which depend on column order behave as they would on the copy.
+    Successive candidates of an iteration (e.g., ``S`` less one feature,
+    in the order of ``S``) differ in one position, so each costs a single
+    column swap.
+
+    The buffer is a second, full copy of the matrices, held for as
+    long as the buffer is.
+
+    Args:
+        arrays : 2d ndarray
+            Matrices with the same number of columns,
+            e.g., ``X_train`` and ``X_val``.
+
+    """
+
+    def __init__(self, *arrays):
+        self._arrays = [np.array(a, order='F') for a in arrays]
+        n_features = self._arrays[0].shape[1]
+        self._perm = np.arange(n_features)  # feature at each position
+        self._pos = np.arange(n_features)  # position of each feature
+
+    def _swap(self, i, j):
+        """Swap the columns at positions `i` and `j`."""
+        for a in self._arrays:
+            column = a[:, i].copy()
+            a[:, i] = a[:, j]
+            a[:, j] = column
+        fi, fj = self._perm[i], self._perm[j]
+        self._perm[i], self._perm[j] = fj, fi
+        self._pos[fi], self._pos[fj] = j, i
+
+    def views(self, features):
+        """Get views of every buffered matrix restricted to `features`.
+
+        Args:
+            features : list
+                The column indices (of the original matrices) to select.
+
+        Returns:
+            views : list of 2d ndarrays
+                One view per buffered matrix.
+
+        """
+        k = len(features)
+        features = np.asarray(features, dtype=int)
+        # Positions before `i` are settled, so the feature due at `i`
+        # always lies at or after it.
+        for i in np.flatnonzero(self._perm[:k] != features):
+            if self._perm[i] != features[i]:
+                self._swap(i, self._pos[features[i]])
+        return [a[:, :k] for a in self._arrays]
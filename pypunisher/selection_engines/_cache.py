@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+"""
+Score Caching
+=============
+"""
+import hashlib
+import os
+import struct
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# Criteria, in the order they are encoded on disk.
+_CRITERIA = (None, 'aic', 'bic')
+
+# Record layout: fingerprint, criterion, mask length, mask, score.
+_HEAD = struct.Struct('<16sBI')
+_SCORE = struct.Struct('<d')
+
+# Rows hashed at a time when fingerprinting (possibly memory-mapped) arrays.
+_HASH_CHUNK_ROWS = 4096
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def subset_key(features, criterion):
+    """Build a cache key for a feature subset.
+
+    Args:
+        features : list
+            Column indices of the subset.
+        criterion : str or None
+            The criterion the subset was scored with.
+
+    Returns:
+        key : tuple
+            ``(mask, criterion)``, where `mask` is an int with
+            bit `f` set for every `f` in `features`.
+
+    """
+    mask = 0
+    for f in features:
+        mask |= 1 << int(f)
+    return mask, criterion
+
+
+class ScoreCache(object):
+    """Bounded mapping of feature subsets to scores with
+    least-recently-used eviction.
+
+    Args:
+        maxsize : int or None
+            The largest number of scores to hold.
+            If None, the cache is unbounded.
+
+    """
+
+    def __init__(self, maxsize):
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 1):
+            raise ValueError("`cache_size` must be a positive int or None.")
+        self._maxsize = maxsize
+        self._scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Look up the score of `key`.
+
+        Args:
+            key : tuple
+                A key, as returned by ``subset_key()``.
+
+        Returns:
+            float or None
+                The cached score, or None on a miss.
+
+        """
+        try:
+            score = self._scores[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        """Store the score of `key`, evicting the least
+        recently used score if the cache is full.
+
+        Args:
+            key : tuple
+                A key, as returned by ``subset_key()``.
+            score : float
+                The score of the subset.
+
+        """
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if self._maxsize is not None and len(self._scores) > self._maxsize:
+            self._scores.popitem(last=False)
+
+    def info(self):
+        """Get cache statistics.
+
+        Returns:
+            CacheInfo
+                A named tuple of ``(hits, misses, maxsize, currsize)``.
+
+        """
+        return CacheInfo(self.hits, self.misses,
+                         self._maxsize, len(self._scores))
+
+
+def fingerprint(model, criterion, *arrays):
+    """Digest the inputs which determine the score of a subset.
+
+    Args:
+        model : sklearn model
+            The model. Its class and ``get_params()`` are digested,
+            except for ``n_jobs``, which does not affect scores (and
+            is set by the CPU plan).
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+        arrays : ndarray
+            The data, e.g., ``X_train, y_train, X_val, y_val``.
+
+    Returns:
+        digest : bytes
+            A 16 byte digest.
+
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update("{}.{}".format(type(model).__module__,
+                            type(model).__qualname__).encode())
+    get_params = getattr(model, 'get_params', None)
+    if get_params is not None:
+        params = get_params(deep=False)
+        params.pop('n_jobs', None)
+        h.update(repr(sorted(params.items())).encode())
+    h.update(repr(criterion).encode())
+    for a in arrays:
+        h.update("{}{}".format(a.shape, a.dtype.str).encode())
+        for start in range(0, max(a.shape[0], 1), _HASH_CHUNK_ROWS):
+            h.update(np.ascontiguousarray(a[start:start + _HASH_CHUNK_ROWS]).data)
+    return h.digest()
+
+
+class DiskScoreCache(object):
+    """Append-only file of subset scores.
+
+    Each record holds the fingerprint of the inputs it was computed from,
+    so one file may be shared by runs on different data or models; only
+    records matching `fingerprint` are used. Records are appended with a
+    single ``write()`` on a file opened with ``O_APPEND``, and readers
+    ignore a trailing partial record, so the file is safe to read while
+    other processes are writing to it.
+
+    Args:
+        path : str
+            Path to the cache file. It is created if it does not exist.
+        fingerprint : bytes
+            A digest, as returned by ``fingerprint()``.
+
+    """
+
+    def __init__(self, path, fingerprint):
+        self._path = os.fspath(path)
+        self._fingerprint = fingerprint
+
+    def load(self):
+        """Read the scores matching this cache's fingerprint.
+
+        Returns:
+            list of tuples
+                ``(key, score)`` pairs, oldest first.
+
+        """
+        try:
+            with open(self._path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return list()
+
+        items, offset = list(), 0
+        while offset + _HEAD.size <= len(data):
+            fp, criterion, length = _HEAD.unpack_from(data, offset)
+            end = offset + _HEAD.size + length + _SCORE.size
+            if end > len(data):
+                break  # partially written record
+            if fp == self._fingerprint:
+                mask = int.from_bytes(data[offset + _HEAD.size:end - _SCORE.size],
+                                      'little')
+                (score,) = _SCORE.unpack_from(data, end - _SCORE.size)
+                items.append(((mask, _CRITERIA[criterion]), score))
+            offset = end
+        return items
+
+    def append(self, items):
+        """Append scores to the file.
+
+        Args:
+            items : list of tuples
+                ``(key, score)`` pairs, where `key` is as
+                returned by ``subset_key()``.
+
+        """
+        records = list()
+        for (mask, criterion), score in items:
+            mask = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+            records.append(_HEAD.pack(self._fingerprint,
+                                      _CRITERIA.index(criterion), len(mask)))
+            records.append(mask)
+            records.append(_SCORE.pack(score))
+        if not records:
+            return
+        fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, b''.join(records))
+        finally:
+            os.close(fd)
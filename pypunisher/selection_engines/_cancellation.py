@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+Cancellation
+============
+Stop a selection running in another thread, between candidate fits.
+"""
+import threading
+from concurrent.futures import CancelledError
+
+
+class CancelScope(object):
+    """Cancel the work of one selection run.
+
+    Once ``cancel()`` is called, ``check()`` raises ``CancelledError``
+    (so the run stops at its next candidate), no further tasks are
+    submitted, and tasks already submitted but not yet started are
+    cancelled. Tasks already running finish.
+
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._futures = set()
+
+    def check(self):
+        """Raise ``CancelledError`` if the run was cancelled."""
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+    def bind(self, executor):
+        """Wrap `executor` so that its tasks may be cancelled."""
+        return _BoundExecutor(self, executor)
+
+    def _track(self, future):
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def cancel(self):
+        """Cancel the run."""
+        self._cancelled.set()
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+class _BoundExecutor(object):
+    """Submits to an executor on behalf of a ``CancelScope``."""
+
+    def __init__(self, scope, executor):
+        self._scope = scope
+        self._executor = executor
+
+    def submit(self, fn, *args):
+        self._scope.check()
+        future = self._executor.submit(fn, *args)
+        if callable(getattr(future, 'add_done_callback', None)):
+            self._scope._track(future)
+            if self._scope._cancelled.is_set():  # cancelled meanwhile.
+                future.cancel()
+        return future
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+
+"""
+Linear Selection Engines
+========================
+Closed-form candidate scoring for ordinary least squares.
+Rather than refitting a model for every candidate, these engines
+update a factorization of the current feature set and score all
+candidates of an iteration with a handful of matrix products.
+
+The data are read in blocks of rows, so memory-mapped matrices are never
+loaded in full; only the columns a computation needs are read.
+"""
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from pypunisher.metrics.criterion import _aic_from_rss, _bic_from_rss
+
+# Relative residual norm below which a column is considered
+# linearly dependent on the current feature set.
+_DEPENDENCE_TOL = 1e-10
+
+# Rows read at a time. Bounds the size of temporaries
+# (and of reads from memory-mapped data).
+_CHUNK_ROWS = 65536
+
+
+def _row_chunks(n):
+    """Split ``range(n)`` into slices of at most `_CHUNK_ROWS` rows."""
+    return [slice(i, min(i + _CHUNK_ROWS, n)) for i in range(0, n, _CHUNK_ROWS)]
+
+
+def _read(X, rows, columns):
+    """Read `columns` of `X` on `rows` as a float array."""
+    return np.asarray(X[rows, columns], dtype=float)
+
+
+def _sum_of_squares(X, center=None):
+    """Column sums of squares of `X`, optionally about `center`."""
+    total = np.zeros(X.shape[1])
+    for rows in _row_chunks(X.shape[0]):
+        block = _read(X, rows, slice(None))
+        if center is not None:
+            block = block - center
+        total += (block ** 2).sum(axis=0)
+    return total
+
+
+def supports_linear_engine(model, y_train):
+    """Check if `model` can be scored by the linear engines.
+
+    Args:
+        model : sklearn model
+            Any sklearn model.
+        y_train : ndarray
+            The response variable.
+
+    Returns:
+        bool
+            True if `model` is a plain (unconstrained) ``LinearRegression``
+            and `y_train` is one dimensional.
+
+    """
+    return (type(model) is LinearRegression
+            and not getattr(model, 'positive', False)
+            and y_train.ndim == 1)
+
+
+def score_from_rss(rss, n, ss_tot, k, criterion):
+    """Convert validation residual sums of squares into scores.
+
+    Args:
+        rss : ndarray
+            Validation residual sum of squares, one per candidate.
+        n : int
+            Number of validation samples.
+        ss_tot : float
+            Total sum of squares of the validation labels
+            about their mean.
+        k : int or ndarray
+            Number of features in each candidate.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+
+    Returns:
+        scores : ndarray
+            The score each candidate would receive through
+            ``aic()``, ``bic()`` or ``LinearRegression.score()``.
+
+    """
+    if criterion == 'aic':
+        return _aic_from_rss(rss, n=n, k=k)
+    elif criterion == 'bic':
+        return _bic_from_rss(rss, n=n, k=k)
+
+    # Coefficient of determination (R^2), as in `sklearn.metrics.r2_score`.
+    if ss_tot == 0:
+        return np.where(rss == 0, 1.0, 0.0)
+    return 1 - rss / ss_tot
+
+
+def _dropped_feature(old, new):
+    """Get the single feature dropped from `old` to give `new`.
+
+    Args:
+        old : list or None
+            The previous feature set.
+        new : list
+            The current feature set.
+
+    Returns:
+        int or None
+            The dropped feature, or None if `new` is not
+            `old` less one feature.
+
+    """
+    if old is None or len(new) != len(old) - 1:
+        return None
+    dropped = set(old) - set(new)
+    return dropped.pop() if len(dropped) == 1 else None
+
+
+class ForwardQR(object):
+    """Incremental QR (Gram-Schmidt) engine for forward selection.
+
+    Keeps an orthonormal basis, ``Q``, of the already-selected training
+    columns (and the intercept, if fitted), along with a matrix ``T`` such
+    that ``Q = [1, X_S] @ T``. Each candidate is then scored by the
+    projection of its residual (w.r.t. ``Q``) onto the response, which
+    yields the exact least squares fit of ``S + [j]`` without refitting.
+
+    Candidates which are linearly dependent on the current feature set
+    receive a zero coefficient, i.e., the minimum norm solution when the
+    column carries no new information (e.g., constant columns). Their
+    residuals are taken to be exactly those of the current model, so that
+    they tie with it rather than winning or losing on rounding error.
+
+    Args:
+        X_train, y_train, X_val, y_val : ndarray
+            The data, as passed to ``Selection``.
+        fit_intercept : bool
+            Whether the model fits an intercept.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+
+    """
+
+    def __init__(self, X_train, y_train, X_val, y_val,
+                 fit_intercept, criterion):
+        self._X_train = X_train
+        self._y_train = np.asarray(y_train, dtype=float)
+        self._X_val = X_val
+        self._y_val = np.asarray(y_val, dtype=float)
+        self._ss_tot = ((self._y_val - self._y_val.mean()) ** 2).sum()
+        self._fit_intercept = fit_intercept
+        self.criterion = criterion
+        self._col_norms = _sum_of_squares(X_train)
+        self._last_rss = (None, dict())
+        self._reset()
+
+    def _reset(self):
+        """Drop the basis and start from the empty model."""
+        n = self._X_train.shape[0]
+        self._S = list()
+        if self._fit_intercept:
+            self._Q = np.full((n, 1), 1 / np.sqrt(n))
+            self._T = np.full((1, 1), 1 / np.sqrt(n))
+        else:
+            self._Q = np.empty((n, 0))
+            self._T = np.empty((0, 0))
+        self._Qty = self._Q.T @ self._y_train
+        self._rss = self._current_rss()
+
+    def _design_val(self, rows):
+        """Validation design matrix of the current feature set on `rows`."""
+        X_val = _read(self._X_val, rows, self._S)
+        if self._fit_intercept:
+            return np.column_stack((np.ones(X_val.shape[0]), X_val))
+        return X_val
+
+    def _current_rss(self):
+        """Validation residual sum of squares of the current model."""
+        b = self._T @ self._Qty
+        return sum(((self._y_val[rows] - self._design_val(rows) @ b) ** 2).sum()
+                   for rows in _row_chunks(self._y_val.shape[0]))
+
+    def _append(self, feature):
+        """Add `feature` to the basis."""
+        x = _read(self._X_train, slice(None), feature)
+        # Classical Gram-Schmidt, applied twice for numerical stability.
+        c = self._Q.T @ x
+        r = x - self._Q @ c
+        c2 = self._Q.T @ r
+        r -= self._Q @ c2
+        c += c2
+        rho = np.sqrt(r @ r)
+
+        T = np.vstack((self._T, np.zeros((1, self._T.shape[1]))))
+        if rho > np.sqrt(_DEPENDENCE_TOL * self._col_norms[feature]):
+            new = np.append(-self._T @ c, 1) / rho
+            T = np.column_stack((T, new))
+            self._Q = np.column_stack((self._Q, r / rho))
+            self._Qty = np.append(self._Qty, (r / rho) @ self._y_train)
+        self._T = T
+        self._S.append(feature)
+
+    def _sync(self, S):
+        """Bring the basis in line with `S`.
+
+        If `S` extends the current feature set by one feature,
+        the basis is updated in place. Otherwise, it is rebuilt.
+
+        """
+        if S and S[:-1] == self._S:
+            self._append(S[-1])
+        elif S != self._S:
+            self._reset()
+            for f in S:
+                self._append(f)
+        else:
+            return
+
+        # Residual sum of squares of the current model. Reuse the value
+        # computed when S[-1] was a candidate, if there is one.
+        last_S, last_rss = self._last_rss
+        if S and S[:-1] == last_S and S[-1] in last_rss:
+            self._rss = last_rss[S[-1]]
+        else:
+            self._rss = self._current_rss()
+
+    def score(self, S, candidates):
+        """Score the model ``S + [j]`` for every `j` in `candidates`.
+
+        Args:
+            S : list
+                The currently selected features.
+            candidates : list
+                The features to add in turn.
+
+        Returns:
+            scores : ndarray
+                One score per candidate.
+
+        """
+        self._sync(list(S))
+        train_chunks = _row_chunks(self._y_train.shape[0])
+
+        # Coordinates of each candidate in the basis, C, and the norm
+        # and projection onto y of its residual, R.
+        C = sum(self._Q[rows].T @ _read(self._X_train, rows, candidates)
+                for rows in train_chunks)
+        norms, Rty = np.zeros(len(candidates)), np.zeros(len(candidates))
+        for rows in train_chunks:
+            R = _read(self._X_train, rows, candidates) - self._Q[rows] @ C
+            norms += (R ** 2).sum(axis=0)
+            Rty += R.T @ self._y_train[rows]
+        independent = norms > _DEPENDENCE_TOL * self._col_norms[candidates]
+        gamma = np.zeros(len(candidates))
+        gamma[independent] = Rty[independent] / norms[independent]
+
+        # With x_j = X_S @ a_j + r_j, the fit of S + [j] is
+        # X_S @ (b - gamma_j * a_j) + gamma_j * x_j.
+        b = self._T @ self._Qty
+        A = self._T @ C
+        rss = np.zeros(len(candidates))
+        for rows in _row_chunks(self._y_val.shape[0]):
+            design_val = self._design_val(rows)
+            pred = ((design_val @ b)[:, np.newaxis]
+                    + (_read(self._X_val, rows, candidates) - design_val @ A)
+                    * gamma)
+            rss += ((self._y_val[rows, np.newaxis] - pred) ** 2).sum(axis=0)
+        rss[~independent] = self._rss
+        self._last_rss = (list(S), dict(zip(candidates, rss)))
+        return score_from_rss(rss, n=self._y_val.shape[0], ss_tot=self._ss_tot,
+                              k=len(S) + 1, criterion=self.criterion)
+
+
+class BackwardSweep(object):
+    """Inverse Gram matrix engine for backward elimination.
+
+    Keeps the inverse Gram matrix, ``G^-1 = (X_S' X_S)^-1``, of the
+    (centered) training columns in ``S`` along with the least squares
+    coefficients, ``b``. Dropping column ``i`` changes the coefficients to
+    ``b - G^-1[:, i] * b_i / G^-1[i, i]`` (a sweep of the i-th pivot),
+    so every candidate of an iteration is scored in closed form, and the
+    state is downdated in O(k^2) once a column is actually dropped.
+
+    The validation data are only read when the state is rebuilt: the
+    residuals are tracked through their cross products with the columns
+    of ``X_val @ G^-1``, and the Gram matrix of those columns, so neither
+    scoring nor a downdate depends on the number of validation rows.
+
+    Columns which are constant on the training data are inert: their
+    coefficient is always zero and dropping them leaves the fit unchanged.
+    If the remaining columns are collinear, ``score()`` returns None and
+    the caller should fall back to fitting the model.
+
+    Args:
+        X_train, y_train, X_val, y_val : ndarray
+            The data, as passed to ``Selection``.
+        fit_intercept : bool
+            Whether the model fits an intercept.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+
+    """
+
+    def __init__(self, X_train, y_train, X_val, y_val,
+                 fit_intercept, criterion):
+        self._X_train = X_train
+        self._y_train = np.asarray(y_train, dtype=float)
+        self._X_val = X_val
+        self._y_val = np.asarray(y_val, dtype=float)
+        self._ss_tot = ((self._y_val - self._y_val.mean()) ** 2).sum()
+        self.criterion = criterion
+
+        if fit_intercept:
+            self._x_mean = sum(_read(X_train, rows, slice(None)).sum(axis=0)
+                               for rows in _row_chunks(X_train.shape[0]))
+            self._x_mean /= X_train.shape[0]
+            self._y_mean = self._y_train.mean()
+        else:
+            self._x_mean = np.zeros(X_train.shape[1])
+            self._y_mean = 0.
+        centered = _sum_of_squares(X_train, center=self._x_mean)
+        self._inert = centered <= _DEPENDENCE_TOL * _sum_of_squares(X_train)
+
+        self._S = None
+        self._last_rss = (None, dict())
+
+    def _rebuild(self, S):
+        """Factor the Gram matrix of `S` from scratch.
+
+        Returns:
+            bool
+                False if the active columns of `S` are collinear.
+
+        """
+        active = [f for f in S if not self._inert[f]]
+        mean = self._x_mean[active]
+        G, Xty = np.zeros((len(active), len(active))), np.zeros(len(active))
+        for rows in _row_chunks(self._y_train.shape[0]):
+            X_c = _read(self._X_train, rows, active) - mean
+            G += X_c.T @ X_c
+            Xty += X_c.T @ (self._y_train[rows] - self._y_mean)
+        eigvals, eigvecs = np.linalg.eigh(G)
+        if len(active) and eigvals[0] <= _DEPENDENCE_TOL * eigvals[-1]:
+            self._S = None
+            return False
+
+        self._S = list(S)
+        self._active = active
+        self._G_inv = (eigvecs / eigvals) @ eigvecs.T
+        self._b = self._G_inv @ Xty
+        # Cross products of the (centered) validation data.
+        V, Vty, yty = np.zeros_like(G), np.zeros(len(active)), 0.
+        for rows in _row_chunks(self._y_val.shape[0]):
+            X_val_c = _read(self._X_val, rows, active) - mean
+            y_val_c = self._y_val[rows] - self._y_mean
+            V += X_val_c.T @ X_val_c
+            Vty += X_val_c.T @ y_val_c
+            yty += y_val_c @ y_val_c
+        # With W = X_val_c @ G^-1 and residuals e = y_val_c - X_val_c @ b,
+        # keep M = W'W and u = W'e.
+        self._M = self._G_inv @ V @ self._G_inv
+        self._u = self._G_inv @ (Vty - V @ self._b)
+        self._rss = yty - 2 * self._b @ Vty + self._b @ V @ self._b
+        return True
+
+    def _drop(self, feature):
+        """Sweep `feature` out of the current state."""
+        self._S.remove(feature)
+        if self._inert[feature]:
+            return
+        i = self._active.index(feature)
+        keep = [a for a in range(len(self._active)) if a != i]
+        pivot = self._G_inv[i, i]
+        t = self._b[i] / pivot
+        g = self._G_inv[keep, i] / pivot
+
+        # The residuals become e + W[:, i] * t, and W[:, keep] becomes
+        # W[:, keep] - outer(W[:, i], g).
+        m_i, m_ii, u_i = self._M[keep, i], self._M[i, i], self._u[i]
+        self._rss += 2 * t * u_i + t ** 2 * m_ii
+        self._u = self._u[keep] + m_i * t - g * (u_i + m_ii * t)
+        self._M = (self._M[np.ix_(keep, keep)] - np.outer(m_i, g)
+                   - np.outer(g, m_i) + np.outer(g, g) * m_ii)
+        self._b = self._b[keep] - self._G_inv[keep, i] * t
+        self._G_inv = (self._G_inv[np.ix_(keep, keep)]
+                       - np.outer(self._G_inv[keep, i],
+                                  self._G_inv[i, keep]) / pivot)
+        del self._active[i]
+
+    def _sync(self, S):
+        """Bring the state in line with `S`.
+
+        If `S` is the current feature set less one feature, that
+        feature is swept out. Otherwise, the state is rebuilt.
+
+        Returns:
+            bool
+                False if the engine cannot score `S`.
+
+        """
+        if S == self._S:
+            return True
+        feature = _dropped_feature(self._S, S)
+        if feature is not None:
+            self._drop(feature)
+        elif not self._rebuild(S):
+            return False
+
+        # Residual sum of squares of the current model. Reuse the value
+        # computed when the dropped feature was a candidate, if there is one.
+        last_S, last_rss = self._last_rss
+        feature = _dropped_feature(last_S, S)
+        if feature in last_rss:
+            self._rss = last_rss[feature]
+        return True
+
+    def score(self, S, candidates):
+        """Score the model ``S`` less `j` for every `j` in `candidates`.
+
+        Args:
+            S : list
+                The current features.
+            candidates : list
+                The features to drop in turn. None denotes
+                dropping nothing, i.e., scoring `S` itself.
+
+        Returns:
+            scores : ndarray or None
+                One score per candidate, or None if the active
+                columns of `S` are collinear.
+
+        """
+        if not self._sync(list(S)):
+            return None
+
+        diag = np.diag(self._G_inv)
+        t = self._b / diag
+        # ||e + w_i t_i||^2 for the residuals, e, of the current model.
+        active_rss = self._rss + 2 * t * self._u + t ** 2 * np.diag(self._M)
+        position = {f: a for a, f in enumerate(self._active)}
+        rss = np.array([self._rss if j is None or j not in position
+                        else active_rss[position[j]] for j in candidates])
+        self._last_rss = (list(S), {j: r for j, r in zip(candidates, rss)
+                                    if j is not None})
+
+        k = np.array([len(S) if j is None else len(S) - 1 for j in candidates])
+        return score_from_rss(rss, n=self._y_val.shape[0], ss_tot=self._ss_tot,
+                              k=k, criterion=self.criterion)
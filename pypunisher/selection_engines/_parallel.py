@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+"""
+Parallel Candidate Evaluation
+=============================
+"""
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier, is_regressor
+from sklearn.metrics import accuracy_score, r2_score
+
+from pypunisher.metrics.criterion import aic, bic, _aic_from_rss, _bic_from_rss
+from pypunisher.selection_engines._scheduler import blas_limits
+from pypunisher.selection_engines._shared import SharedArrays
+
+
+def fit_and_score(model, X_train, y_train, X_val, y_val, features, criterion,
+                  warm=None, fit_params=None):
+    """Fit `model` on the `features` columns of `X_train`
+    and score it against the validation data.
+
+    Args:
+        model : sklearn model
+            A trainable sklearn model. It is fitted in place.
+        X_train : 2d ndarray
+            Training features.
+        y_train : 1d ndarray
+            Training labels.
+        X_val : 2d ndarray
+            Validation features.
+        y_val : 1d ndarray
+            Validation labels.
+        features : list or slice
+            The column indices to use.
+        criterion : str, None or tuple
+            One of: None, 'aic', 'bic', or a tuple of them
+            (see ``score_fitted()``).
+        warm : WarmStart or None
+            If given, `model` starts fitting from its coefficients.
+        fit_params : dict or None
+            Passed to ``model.fit()`` (e.g., as returned by
+            ``WarmStart.prime()``, if `model` was primed already).
+
+    Returns:
+        score : float
+            The score of the model.
+
+    """
+    fit_params = dict(fit_params or {})
+    if warm is not None:
+        fit_params.update(warm.prime(model, features))
+    model.fit(X_train[:, features], y_train, **fit_params)
+    return score_fitted(model, X_val=X_val[:, features], y_val=y_val,
+                        criterion=criterion)
+
+
+def score_fitted(model, X_val, y_val, criterion):
+    """Score a fitted `model` against the validation data.
+
+    Args:
+        model : sklearn model
+            A fitted sklearn model.
+        X_val : 2d ndarray
+            Validation features (the columns `model` was fitted on).
+        y_val : 1d ndarray
+            Validation labels.
+        criterion : str, None or tuple
+            One of: None, 'aic', 'bic'. If a tuple of them, the model
+            predicts once, and the scores under all of them are computed
+            from that single prediction.
+
+    Returns:
+        score : float or MultiScore
+            The score of the model. With a tuple of criteria, a
+            ``MultiScore`` of the first.
+
+    """
+    if isinstance(criterion, tuple):
+        return _score_all(model, X_val=X_val, y_val=y_val, criteria=criterion)
+    if criterion == 'aic':
+        # Note: We want to do selection against the validation
+        # data, hence `X_train=X_val` and `y_train=y_val`.
+        return aic(model, X_train=X_val, y_train=y_val)
+    elif criterion == 'bic':
+        return bic(model, X_train=X_val, y_train=y_val)
+    else:
+        return model.score(X_val, y_val)
+
+
+class MultiScore(float):
+    """The score of a model under one criterion, carrying its
+    scores under several, computed from the same fit.
+
+    Args:
+        value : float
+            The score under the first criterion.
+        by_criterion : dict
+            Maps each criterion to the score under it.
+
+    """
+
+    def __new__(cls, value, by_criterion):
+        self = super(MultiScore, cls).__new__(cls, value)
+        self.by_criterion = by_criterion
+        return self
+
+    def __reduce__(self):
+        return MultiScore, (float(self), self.by_criterion)
+
+
+def _score_all(model, X_val, y_val, criteria):
+    """``score_fitted()`` under several `criteria`, predicting once."""
+    y_pred = model.predict(X_val)
+    n, k = X_val.shape
+    # As in `aic()` and `bic()`, so that the scores are identical.
+    rss = ((y_val - y_pred) ** 2).sum()
+    by_criterion = dict()
+    for criterion in criteria:
+        if criterion == 'aic':
+            score = float(_aic_from_rss(rss, n=n, k=k))
+        elif criterion == 'bic':
+            score = float(_bic_from_rss(rss, n=n, k=k))
+        elif is_regressor(model):  # as in `model.score()`.
+            score = r2_score(y_val, y_pred)
+        elif is_classifier(model):
+            score = accuracy_score(y_val, y_pred)
+        else:
+            score = model.score(X_val, y_val)
+        by_criterion[criterion] = score
+    return MultiScore(by_criterion[criteria[0]], by_criterion)
+
+
+def _unpack(data):
+    """The arrays of `data`: a tuple of arrays or ``SharedArrays``."""
+    return data.arrays() if isinstance(data, SharedArrays) else data
+
+
+def _limited_fit_and_score(blas_threads, model, data, features, criterion,
+                           warm=None):
+    """``fit_and_score()`` with native thread pools limited (in the worker)."""
+    with blas_limits(blas_threads):
+        return fit_and_score(model, *_unpack(data), features, criterion, warm)
+
+
+def parallel_fit_and_score(model, X_train, y_train, X_val, y_val,
+                           subsets, criterion, n_jobs, backend,
+                           blas_threads=None, shared=None, warm=None):
+    """Score several feature subsets concurrently.
+
+    Each subset is fitted on its own clone of `model`, so
+    candidates never share estimator state.
+
+    Args:
+        model : sklearn model
+            The (unfitted) template model.
+        X_train, y_train, X_val, y_val : ndarray
+            See ``fit_and_score()``.
+        subsets : list of lists
+            The feature subsets to score.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+        n_jobs : int
+            Number of concurrent jobs, as understood by ``joblib``.
+        backend : str
+            A ``joblib`` backend, e.g., 'loky' or 'threading'.
+        blas_threads : int or None
+            Limit on the native (BLAS/OpenMP) threads of each fit.
+            If None, no limit is imposed.
+        shared : SharedArrays or None
+            If given, a shared copy of the data, which workers
+            open in place of receiving the arrays.
+        warm : WarmStart or None
+            See ``fit_and_score()``.
+
+    Returns:
+        scores : list
+            The score of each subset, in the order of `subsets`.
+
+    """
+    data = (X_train, y_train, X_val, y_val) if shared is None else shared
+    return Parallel(n_jobs=n_jobs, backend=backend)(
+        delayed(_limited_fit_and_score)(blas_threads, clone(model), data,
+                                        features, criterion, warm)
+        for features in subsets
+    )
+
+
+def fit_and_score_batch(model, data, subsets, criterion, warm=None):
+    """Score several feature subsets, one after another, as a single task.
+
+    Args:
+        model : sklearn model
+            The (unfitted) template model. The subsets
+            are fitted on a single clone of it.
+        data : tuple or SharedArrays
+            ``(X_train, y_train, X_val, y_val)``, as in ``fit_and_score()``.
+        subsets : list of lists
+            The feature subsets to score.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+        warm : WarmStart or None
+            See ``fit_and_score()``.
+
+    Returns:
+        scores : list
+            The score of each subset, in the order of `subsets`.
+
+    """
+    model = clone(model)
+    X_train, y_train, X_val, y_val = _unpack(data)
+    return [fit_and_score(model, X_train, y_train, X_val, y_val,
+                          features, criterion, warm) for features in subsets]
+
+
+def executor_fit_and_score(executor, model, X_train, y_train, X_val, y_val,
+                           subsets, criterion, batch_size, shared=None,
+                           warm=None):
+    """Score several feature subsets through an executor.
+
+    Args:
+        executor : concurrent.futures.Executor-like
+            Any object with a ``submit(fn, *args)`` method returning
+            a future, i.e., an object with a ``result()`` method.
+        model : sklearn model
+            The (unfitted) template model.
+        X_train, y_train, X_val, y_val : ndarray
+            See ``fit_and_score()``.
+        subsets : list of lists
+            The feature subsets to score.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+        batch_size : int
+            The number of subsets scored by each task.
+        shared : SharedArrays or None
+            See ``parallel_fit_and_score()``.
+        warm : WarmStart or None
+            See ``fit_and_score()``.
+
+    Returns:
+        scores : list
+            The score of each subset, in the order of `subsets`.
+
+    """
+    data = (X_train, y_train, X_val, y_val) if shared is None else shared
+    futures = [
+        executor.submit(fit_and_score_batch, model, data,
+                        subsets[start:start + batch_size], criterion, warm)
+        for start in range(0, len(subsets), batch_size)
+    ]
+    return [score for future in futures for score in future.result()]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+Racing
+======
+Early rejection of candidates from their validation
+residuals, accumulated one block of rows at a time.
+"""
+import numpy as np
+from scipy.stats import norm
+
+_RACING_ROWS = 1024
+
+
+class Race(object):
+    """Race candidate models against the best model found so far.
+
+    Within an iteration of ``forward()`` or ``backward()`` every candidate
+    has the same number of features, so ``aic()``, ``bic()`` and R^2 (the
+    ``.score()`` of sklearn regressors) all rank candidates by their
+    validation residual sum of squares alone. A candidate is therefore
+    compared with the incumbent through the paired, per row, differences
+    of their squared residuals, and rejected as soon as a (normal)
+    confidence bound on the mean difference shows that it loses.
+
+    Args:
+        y_val : 1d ndarray
+            Validation labels.
+        confidence : float
+            Confidence level of the bound, on (0, 1).
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+
+    """
+
+    def __init__(self, y_val, confidence, criterion):
+        self._y_val = np.asarray(y_val, dtype=float)
+        self._z = norm.ppf(confidence)
+        # R^2 falls as the residual sum of squares grows; with equal
+        # numbers of features, AIC and BIC rise with it. A positive
+        # (signed) difference thus always means a lower score.
+        self._sign = 1. if criterion is None else -1.
+        self._incumbent = None  # squared residuals of the best model
+
+    def run(self, model, X_val, features):
+        """Race a fitted `model` against the incumbent.
+
+        Args:
+            model : sklearn model
+                A fitted sklearn regressor.
+            X_val : 2d ndarray
+                The (possibly memory-mapped) validation features.
+            features : list
+                The columns `model` was fitted on.
+
+        Returns:
+            squared_residuals : 1d ndarray or None
+                The squared validation residuals of `model`,
+                or None if it was rejected.
+
+        """
+        n = self._y_val.shape[0]
+        losses = np.empty(n)
+        total, total_sq = 0., 0.
+        for start in range(0, n, _RACING_ROWS):
+            rows = slice(start, min(start + _RACING_ROWS, n))
+            y_pred = model.predict(X_val[rows][:, features])
+            losses[rows] = (self._y_val[rows] - y_pred) ** 2
+            if self._incumbent is None or rows.stop == n:
+                continue
+            d = self._sign * (losses[rows] - self._incumbent[rows])
+            total, total_sq = total + d.sum(), total_sq + (d ** 2).sum()
+            m = rows.stop
+            mean = total / m
+            se = np.sqrt(max(total_sq / m - mean ** 2, 0) / m)
+            if mean - self._z * se > 0:
+                return None
+        return losses
+
+    def crown(self, squared_residuals):
+        """Make the model with `squared_residuals` the incumbent."""
+        self._incumbent = squared_residuals
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+CPU Budget
+==========
+Split a budget of cores between concurrent candidate fits, the
+estimator's own ``n_jobs`` and native (BLAS/OpenMP) thread pools.
+"""
+import time
+import warnings
+from collections import namedtuple
+from contextlib import contextmanager
+from math import ceil
+
+from joblib import cpu_count
+from threadpoolctl import ThreadpoolController
+
+# Rough cost (in seconds) of sending one candidate to a worker.
+_DISPATCH_OVERHEAD = 2e-3
+
+CpuPlan = namedtuple('CpuPlan', ['outer', 'n_jobs', 'blas_threads'])
+
+_controller = None  # inspecting the loaded libraries is slow: do it once.
+
+
+def declares_n_jobs(model):
+    """Whether `model` declares an ``n_jobs`` parameter."""
+    return 'n_jobs' in model.get_params(deep=False)
+
+
+@contextmanager
+def blas_limits(blas_threads):
+    """Limit native thread pools to `blas_threads` (None: no limit)."""
+    global _controller
+    if blas_threads is None:
+        yield
+        return
+    if _controller is None:
+        _controller = ThreadpoolController()
+    with _controller.limit(limits=blas_threads):
+        yield
+
+
+def _timed(fit, n_jobs, blas_threads):
+    start = time.perf_counter()
+    with blas_limits(blas_threads):
+        fit(n_jobs)
+    return time.perf_counter() - start
+
+
+def _ignores_n_jobs(caught):
+    """Whether the warnings `caught` from a fit say that the estimator
+    ignores ``n_jobs`` (e.g., as it is deprecated)."""
+    return any('n_jobs' in str(w.message) for w in caught)
+
+
+class CpuBudget(object):
+    """Plan the use of a fixed number of cores.
+
+    The serial fit time of a representative candidate, and its time when
+    given every core (through the estimator's ``n_jobs`` or through native
+    thread pools, whichever is faster), fix the parallel fraction of a
+    fit (Amdahl's law). The plan is the number of concurrent candidates
+    which, with the remaining cores given to each fit, minimises the
+    predicted time of an iteration.
+
+    A single concurrent candidate (``outer=1``) is given the whole budget,
+    through the estimator's ``n_jobs`` (if declared) and native thread
+    pools alike, without timing anything.
+
+    Args:
+        n_cpus : int or None
+            The number of cores to use. If None, all of them.
+
+    """
+
+    def __init__(self, n_cpus=None):
+        self.n_cpus = cpu_count() if n_cpus is None else n_cpus
+
+    def outer(self, n_jobs):
+        """Resolve a ``joblib`` style `n_jobs` (e.g., -1) against the budget."""
+        if n_jobs < 0:
+            return max(1, self.n_cpus + 1 + n_jobs)
+        return min(n_jobs, self.n_cpus)
+
+    def plan(self, fit, n_candidates, n_jobs_declared, outer=None):
+        """Choose how to split the budget.
+
+        Args:
+            fit : callable
+                ``fit(n_jobs)`` fits a representative candidate, passing
+                `n_jobs` to the estimator (ignored if it is not declared).
+            n_candidates : int
+                The number of candidates of an iteration.
+            n_jobs_declared : bool
+                Whether the estimator declares ``n_jobs``.
+            outer : int or None
+                The number of concurrent candidates. If None, chosen.
+
+        Returns:
+            CpuPlan
+                ``(outer, n_jobs, blas_threads)``, where `n_jobs` is None if
+                the estimator's own is to be left as is (e.g., it does not
+                declare it, or warns that it ignores it), and `blas_threads`
+                is None if native thread pools are not to be limited.
+
+        """
+        budget = self.n_cpus
+        if outer == 1:
+            return CpuPlan(1, budget if n_jobs_declared else None, budget)
+        if budget == 1 or outer == budget:
+            return CpuPlan(outer or 1, 1 if n_jobs_declared else None, 1)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            serial = min(_timed(fit, 1, 1) for _ in range(2))  # 1st: warm up
+            if _ignores_n_jobs(caught):
+                n_jobs_declared = False
+            timings = {'blas': _timed(fit, 1, budget)}
+            if n_jobs_declared:
+                timings['n_jobs'] = _timed(fit, budget, 1)
+        mode = min(timings, key=timings.get)
+        speedup = serial / max(timings[mode], 1e-12)
+        fraction = min(max((1 - 1 / speedup) / (1 - 1 / budget), 0.), 1.)
+
+        def iteration_time(o):
+            inner = max(1, budget // o)
+            fit_time = serial * ((1 - fraction) + fraction / inner)
+            overhead = n_candidates * _DISPATCH_OVERHEAD if o > 1 else 0.
+            return ceil(n_candidates / o) * fit_time + overhead
+
+        options = range(1, min(budget, n_candidates) + 1) if outer is None \
+            else [outer]
+        best = min(options, key=iteration_time)
+        inner = max(1, budget // best)
+        if mode == 'n_jobs':
+            return CpuPlan(best, inner, 1)
+        return CpuPlan(best, 1 if n_jobs_declared else None, inner)
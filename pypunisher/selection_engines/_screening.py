@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+"""
+Screening
+=========
+Cheap, vectorized filters which narrow down the
+features passed on to candidate model fits.
+"""
+import hashlib
+
+import numpy as np
+
+from pypunisher.selection_engines._linear import (_DEPENDENCE_TOL, _read,
+                                                  _row_chunks)
+from pypunisher.selection_engines._streaming import SufficientStatistics
+
+
+def residual_correlations(X, residual, columns):
+    """Absolute correlation of columns of `X` with a residual.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        residual : 1d ndarray
+            The residual of the current model.
+        columns : list
+            The columns of `X` to correlate.
+
+    Returns:
+        correlations : 1d ndarray
+            One per column. Constant columns have a correlation of zero.
+
+    """
+    n = X.shape[0]
+    r = residual - residual.mean()
+    sums, squares, dots = (np.zeros(len(columns)) for _ in range(3))
+    for rows in _row_chunks(n):
+        block = _read(X, rows, columns)
+        sums += block.sum(axis=0)
+        squares += (block ** 2).sum(axis=0)
+        dots += block.T @ r[rows]  # as `r` is centered, this is n * cov.
+
+    denominator = np.sqrt(np.maximum(squares - sums ** 2 / n, 0) * (r @ r))
+    correlations = np.zeros(len(columns))
+    positive = denominator > 0
+    correlations[positive] = np.abs(dots[positive]) / denominator[positive]
+    return correlations
+
+
+def subsample_order(y, stratify, random_state=0):
+    """A random order of the rows, whose prefixes serve as
+    nested subsamples (e.g., for successive halving).
+
+    Args:
+        y : 1d ndarray
+            The target.
+        stratify : bool
+            if True (for classifiers), every prefix holds one row of each
+            class, followed by the classes in about their proportions, so
+            that no subsample lacks a class (which many classifiers
+            cannot be fitted without).
+        random_state : int
+            The seed of the permutation.
+
+    Returns:
+        order : 1d ndarray
+            A permutation of ``range(len(y))``.
+
+    """
+    rng = np.random.RandomState(random_state)
+    order = rng.permutation(len(y))
+    if not stratify:
+        return order
+    _, labels = np.unique(np.asarray(y)[order], return_inverse=True)
+    counts = np.bincount(labels)
+    # Within each class (in random order), the i-th row is ranked at
+    # ``(i + 0.5) / count``, interleaving the classes; the first row
+    # of each class goes ahead of all others.
+    rank_in_class = np.empty(len(y))
+    for c, count in enumerate(counts):
+        rows = np.flatnonzero(labels == c)
+        rank_in_class[rows] = (np.arange(count) + 0.5) / count
+        rank_in_class[rows[0]] = -1.
+    return order[np.argsort(rank_in_class, kind='stable')]
+
+
+def top_candidates(candidates, scores, size):
+    """Keep the `size` candidates with the highest `scores`.
+
+    Args:
+        candidates : list
+            The candidates.
+        scores : 1d ndarray
+            A score for each candidate.
+        size : int
+            The number of candidates to keep.
+
+    Returns:
+        list
+            The kept candidates, in their original order (so that
+            ties in later steps are broken as without screening).
+
+    """
+    if len(candidates) <= size:
+        return list(candidates)
+    keep = np.sort(np.argsort(-np.asarray(scores), kind='stable')[:size])
+    return [candidates[i] for i in keep]
+
+
+def column_hashes(X, columns):
+    """Digest the values of columns of `X`, one block of rows at a time.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        columns : list
+            The columns of `X` to digest.
+
+    Returns:
+        list of bytes
+            One digest per column. Equal columns have equal digests.
+
+    """
+    hashes = [hashlib.blake2b(digest_size=16) for _ in columns]
+    for rows in _row_chunks(X.shape[0]):
+        block = np.ascontiguousarray(_read(X, rows, columns).T)
+        for h, values in zip(hashes, block):
+            h.update(values.data)
+    return [h.digest() for h in hashes]
+
+
+def constant_and_duplicate_columns(X, columns):
+    """Find columns which are constant, or equal to an earlier column.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        columns : list
+            The columns of `X` to check.
+
+    Returns:
+        dict
+            Maps each offending column to 'constant' or 'duplicate'.
+            Of several equal columns, the first is kept (unless constant).
+
+    """
+    lo, hi = np.full(len(columns), np.inf), np.full(len(columns), -np.inf)
+    for rows in _row_chunks(X.shape[0]):
+        block = _read(X, rows, columns)
+        lo, hi = np.minimum(lo, block.min(axis=0)), np.maximum(hi, block.max(axis=0))
+
+    dropped, seen = dict(), set()
+    for column, is_constant, digest in zip(columns, lo == hi,
+                                           column_hashes(X, columns)):
+        if is_constant:
+            dropped[column] = 'constant'
+        elif digest in seen:
+            dropped[column] = 'duplicate'
+        seen.add(digest)
+    return dropped
+
+
+def collinear_columns(X, columns):
+    """Find columns which are (numerically) linear combinations
+    of earlier columns and the intercept.
+
+    The centered Gram matrix of `columns` is accumulated one block of rows
+    at a time and factored by a Cholesky decomposition which, in column
+    order, rejects any pivot whose residual variance is negligible
+    relative to the column's variance. This reveals the rank of the
+    columns while keeping the earliest of each dependent group.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        columns : list
+            The columns of `X` to check. Should be free of constant columns.
+
+    Returns:
+        list
+            The collinear columns.
+
+    """
+    stats = SufficientStatistics(len(columns))
+    for rows in _row_chunks(X.shape[0]):
+        block = _read(X, rows, columns)
+        stats.update(block, np.zeros(block.shape[0]))
+    G = stats.xx
+
+    # Column-by-column (left-looking) Cholesky: column k of L holds the
+    # k-th kept pivot, filled for its own and all later rows, so each
+    # step is a single matrix-vector product and nothing is copied.
+    collinear, k = list(), 0
+    L = np.zeros_like(G)
+    for i, column in enumerate(columns):
+        l = L[i, :k]
+        d = G[i, i] - l @ l
+        if d <= _DEPENDENCE_TOL * G[i, i]:
+            collinear.append(column)
+            continue
+        L[i:, k] = (G[i:, i] - L[i:, :k] @ l) / np.sqrt(d)
+        k += 1
+    return collinear
+
+
+def preflight_columns(X, columns):
+    """Find constant, duplicate and collinear columns.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        columns : list
+            The columns of `X` to check.
+
+    Returns:
+        dict
+            Maps each offending column to 'constant',
+            'duplicate' or 'collinear'.
+
+    """
+    dropped = constant_and_duplicate_columns(X, columns)
+    remaining = [c for c in columns if c not in dropped]
+    dropped.update((c, 'collinear') for c in collinear_columns(X, remaining))
+    return dropped
+
+
+def sure_independence_screen(X, y, columns, size):
+    """Sure independence screening (Fan & Lv, 2008).
+
+    Constant and duplicate columns are dropped. Of the rest, the `size`
+    columns with the largest absolute (marginal) correlation with `y`
+    survive.
+
+    Args:
+        X : 2d ndarray
+            The (possibly memory-mapped) feature matrix.
+        y : 1d ndarray
+            The response variable.
+        columns : list
+            The columns of `X` to screen.
+        size : int
+            The number of columns to keep.
+
+    Returns:
+        kept : list
+            The surviving columns, in ascending order.
+        dropped : dict
+            Maps each dropped column to 'constant', 'duplicate'
+            or 'screened'.
+
+    Raises:
+        * if `y` is not numeric (e.g., class labels which are strings).
+
+    """
+    y = np.asarray(y)
+    if not (np.issubdtype(y.dtype, np.number) or y.dtype == bool):
+        raise ValueError("Screening requires a numeric `y`.")
+    dropped = constant_and_duplicate_columns(X, columns)
+    remaining = [c for c in columns if c not in dropped]
+    correlations = residual_correlations(X, y.astype(float),
+                                         columns=remaining)
+    kept = top_candidates(remaining, correlations, size=size)
+    dropped.update((c, 'screened') for c in set(remaining) - set(kept))
+    return kept, dropped
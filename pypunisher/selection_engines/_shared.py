@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""
+Shared Data
+===========
+Hand arrays to worker processes without copying them into every task.
+"""
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+from pypunisher.selection_engines._utils import load_array
+
+# The arrays last attached to by this (worker) process, keyed by their
+# files. Only the latest set is kept, so that files removed by ``close()``
+# are not kept mapped (e.g., by the workers of a long-lived pool).
+_attached = dict()
+
+
+def _remove(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _file_layout(a):
+    """Where `a` lies in the file it maps, if it maps one in full.
+
+    Args:
+        a : ndarray
+
+    Returns:
+        tuple or None
+            ``(path, offset, dtype, shape, order)`` if `a` is a memory-mapped
+            file (as opened by ``np.load()`` or ``np.memmap()``, but not a
+            slice of one, nor a copy-on-write mapping, whose changes other
+            processes do not see). Otherwise, None.
+
+    """
+    if not (isinstance(a, np.memmap) and isinstance(a.base, mmap.mmap)
+            and a.filename is not None and a.mode != 'c'):
+        return None
+    order = 'F' if a.flags.f_contiguous and not a.flags.c_contiguous else 'C'
+    return str(a.filename), a.offset, a.dtype.str, a.shape, order
+
+
+def _open(file):
+    """Open a file of ``SharedArrays`` as a read-only memmap."""
+    path, layout = file
+    if layout is None:
+        return load_array(path)
+    offset, dtype, shape, order = layout
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset,
+                     shape=shape, order=order)
+
+
+class SharedArrays(object):
+    """Arrays written once to memory-mapped files, which worker
+    processes open (zero-copy) rather than receive by pickling.
+
+    Arrays which already are memory-mapped files (``.npy`` files opened
+    with ``np.load()``, or raw ones opened with ``np.memmap()``) are referred
+    to by path, offset, dtype and shape. The rest are saved to a temporary directory (in ``/dev/shm``,
+    i.e., in memory, where available). Only the paths are pickled, so each
+    task carries feature indices and not the data.
+
+    The directory is owned by the process which created the instance and
+    is removed by ``close()``, when the instance is garbage collected or,
+    failing that, at interpreter exit. Workers never own (nor remove)
+    anything, so a crashed worker cannot leak or delete the files.
+
+    Args:
+        arrays : ndarray
+            The arrays to share, e.g., ``X_train, y_train, X_val, y_val``.
+
+    """
+
+    def __init__(self, *arrays):
+        shm = '/dev/shm'
+        self._directory = tempfile.mkdtemp(
+            prefix='pypunisher-', dir=shm if os.path.isdir(shm) else None
+        )
+        self._finalizer = weakref.finalize(self, _remove, self._directory)
+        files = list()
+        for i, a in enumerate(arrays):
+            layout = _file_layout(a)
+            if layout is not None:
+                files.append((layout[0], layout[1:]))
+            else:
+                path = os.path.join(self._directory, '{}.npy'.format(i))
+                np.save(path, a)
+                files.append((path, None))
+        self._files = tuple(files)
+
+    @property
+    def paths(self):
+        """The path of the file of each array."""
+        return tuple(path for path, _ in self._files)
+
+    def __getstate__(self):
+        return {'files': self._files}
+
+    def __setstate__(self, state):
+        self._files = state['files']
+        self._finalizer = None  # a copy (e.g., in a worker) owns nothing.
+
+    def arrays(self):
+        """Open the shared arrays (once per process) as read-only memmaps.
+
+        Returns:
+            tuple of ndarrays
+
+        """
+        if self._files not in _attached:
+            _attached.clear()
+            _attached[self._files] = tuple(_open(f) for f in self._files)
+        return _attached[self._files]
+
+    def close(self):
+        """Remove the temporary files. Safe to call more than once."""
+        _attached.pop(self._files, None)
+        if self._finalizer is not None:
+            self._finalizer()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+Speculation
+===========
+Start the next iteration of forward selection before the current one ends.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class Speculator(object):
+    """Score forward candidates through futures, filling idle workers at
+    the tail of each iteration with guesses at the next one.
+
+    Once fewer candidates of the current iteration are outstanding than
+    there are workers, the best `depth` candidates scored so far are taken
+    as leaders, and the candidates of the next iteration are submitted for
+    each leader, i.e., ``S + [leader, j]``. A future is keyed by its exact
+    feature list, so a guess is only reused for the very same fit, and
+    results are identical to those of the sequential algorithm.
+
+    Args:
+        submit : callable
+            ``submit(features)`` returns a future of the score of the
+            model fitted on `features`.
+        n_workers : int
+            The number of tasks which may run at once.
+        depth : int
+            The number of leaders to speculate on per iteration.
+
+    Attributes:
+        hits : int
+            Candidate scores taken from speculative work.
+        wasted : int
+            Speculative tasks whose guess was wrong.
+
+    """
+
+    def __init__(self, submit, n_workers, depth):
+        self._submit = submit
+        self._n_workers = n_workers
+        self._depth = depth
+        self._guesses = dict()  # features -> future
+        self.hits = self.wasted = 0
+
+    def scores(self, S, candidates):
+        """Score the model ``S + [j]`` for every `j` in `candidates`.
+
+        Args:
+            S : list
+                The currently selected features.
+            candidates : list
+                The features to add in turn.
+
+        Returns:
+            scores : list
+                One score per candidate.
+
+        """
+        futures = list()
+        for j in candidates:
+            future = self._guesses.pop(tuple(S + [j]), None)
+            if future is None:
+                future = self._submit(S + [j])
+            else:
+                self.hits += 1
+            futures.append(future)
+        self.discard()
+
+        leaders, pending = set(), set(futures)
+        while pending:
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if len(pending) >= self._n_workers or len(leaders) >= self._depth:
+                continue
+            finished = [(-future.result(), i) for i, future in enumerate(futures)
+                        if future.done() and candidates[i] not in leaders]
+            for _, i in sorted(finished)[:self._depth - len(leaders)]:
+                leader = candidates[i]
+                leaders.add(leader)
+                for j in candidates:
+                    key = tuple(S + [leader, j])
+                    if j != leader and key not in self._guesses:
+                        self._guesses[key] = self._submit(list(key))
+        return [future.result() for future in futures]
+
+    def discard(self):
+        """Cancel (or forget) all outstanding guesses."""
+        for future in self._guesses.values():
+            future.cancel()
+        self.wasted += len(self._guesses)
+        self._guesses.clear()
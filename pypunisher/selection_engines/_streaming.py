@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+"""
+Streaming Selection Engines
+===========================
+Least squares selection from sufficient statistics. The statistics are
+accumulated one block of rows at a time, so memory is proportional to
+the square of the number of features, not to the number of rows.
+"""
+import numpy as np
+
+from pypunisher.selection_engines._linear import (_DEPENDENCE_TOL,
+                                                  _dropped_feature,
+                                                  score_from_rss)
+
+
+class SufficientStatistics(object):
+    """Running means and centered cross products of ``(X, y)``.
+
+    Blocks are merged with the pairwise update of Chan et al., which
+    avoids the cancellation of accumulating raw sums of squares.
+
+    Args:
+        n_features : int
+            Number of columns in `X`.
+
+    """
+
+    def __init__(self, n_features):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.
+        self.xx = np.zeros((n_features, n_features))
+        self.xy = np.zeros(n_features)
+        self.yy = 0.
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """Accumulate statistics over an iterable of row blocks.
+
+        Args:
+            blocks : iterable
+                Yields ``(X, y)`` tuples, where `X` is a 2d array
+                and `y` is a 1d array with as many rows as `X`.
+
+        Returns:
+            SufficientStatistics
+
+        Raises:
+            * if `blocks` is empty.
+
+        """
+        stats = None
+        for X, y in blocks:
+            X = np.asarray(X, dtype=float)
+            if stats is None:
+                stats = cls(X.shape[1])
+            stats.update(X, y)
+        if stats is None or not stats.n:
+            raise ValueError("`blocks` must yield at least one row.")
+        return stats
+
+    def update(self, X, y):
+        """Merge a block of rows into the statistics.
+
+        Args:
+            X : 2d ndarray
+                A block of (observations, features).
+            y : 1d ndarray
+                The responses of the block.
+
+        """
+        X, y = np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+        if X.ndim != 2 or X.shape[1] != self.xy.shape[0] \
+                or y.shape != (X.shape[0],):
+            raise ValueError("Blocks must be (X, y) with X of shape "
+                             "(n, {0}) and y of shape (n,).".format(self.xy.shape[0]))
+        m = X.shape[0]
+        if not m:
+            return
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        X_c, y_c = X - mean_x, y - mean_y
+        dx, dy = mean_x - self.mean_x, mean_y - self.mean_y
+        w = self.n * m / (self.n + m)
+
+        self.xx += X_c.T @ X_c + w * np.outer(dx, dx)
+        self.xy += X_c.T @ y_c + w * dx * dy
+        self.yy += y_c @ y_c + w * dy ** 2
+        self.n += m
+        self.mean_x += dx * m / self.n
+        self.mean_y += dy * m / self.n
+
+    def arrays(self):
+        """The statistics as a tuple of arrays (e.g., for fingerprinting)."""
+        return (np.array([self.n, self.mean_y, self.yy]), self.mean_x,
+                self.xx, self.xy)
+
+
+class _GramEngine(object):
+    """Shared machinery of the sufficient statistics engines.
+
+    Args:
+        train, val : SufficientStatistics
+            Statistics of the training and validation data.
+        fit_intercept : bool
+            Whether the model fits an intercept.
+        criterion : str or None
+            One of: None, 'aic', 'bic'.
+
+    """
+
+    def __init__(self, train, val, fit_intercept, criterion):
+        raw = train.xx + train.n * np.outer(train.mean_x, train.mean_x)
+        if fit_intercept:
+            self._G, self._c = train.xx, train.xy
+            self._mean_x, self._mean_y = train.mean_x, train.mean_y
+        else:
+            self._G = raw
+            self._c = train.xy + train.n * train.mean_x * train.mean_y
+            self._mean_x, self._mean_y = np.zeros_like(train.mean_x), 0.
+        self._inert = np.diag(self._G) <= _DEPENDENCE_TOL * np.diag(raw)
+        self._val = val
+        self.criterion = criterion
+        self._last_rss = (None, dict())  # S and the rss of its candidates
+
+    def _val_rss(self, features, B):
+        """Validation residual sums of squares of several fits.
+
+        Args:
+            features : list
+                The features of the fits.
+            B : 2d ndarray
+                Coefficients, one fit per column.
+
+        Returns:
+            rss : 1d ndarray
+
+        """
+        v = self._val
+        intercepts = self._mean_y - self._mean_x[features] @ B
+        offset = v.mean_y - intercepts - v.mean_x[features] @ B
+        return (v.yy - 2 * B.T @ v.xy[features]
+                + (B * (v.xx[np.ix_(features, features)] @ B)).sum(axis=0)
+                + v.n * offset ** 2)
+
+    def _solve(self, active):
+        """Least squares coefficients on `active` (minimum norm)."""
+        G = self._G[np.ix_(active, active)]
+        return np.linalg.lstsq(G, self._c[active], rcond=None)[0] \
+            if len(active) else np.zeros(0)
+
+    def _scores(self, rss, k):
+        """Convert validation residual sums of squares to scores."""
+        return score_from_rss(rss, n=self._val.n, ss_tot=self._val.yy, k=k,
+                              criterion=self.criterion)
+
+
+class GramForward(_GramEngine):
+    """Forward selection from sufficient statistics.
+
+    For each candidate, ``j``, the least squares fit of ``S + [j]`` is
+    derived from that of ``S`` via the Schur complement of ``G[S, S]``
+    in ``G[S + [j], S + [j]]``.
+
+    """
+
+    def score(self, S, candidates):
+        """Score the model ``S + [j]`` for every `j` in `candidates`.
+
+        Args:
+            S : list
+                The currently selected features.
+            candidates : list
+                The features to add in turn.
+
+        Returns:
+            scores : ndarray
+                One score per candidate.
+
+        """
+        active = [f for f in S if not self._inert[f]]
+        b = self._solve(active)
+        # Residual sum of squares of the current model. Reuse the value
+        # computed when S[-1] was a candidate, if there is one, so that
+        # dependent candidates score exactly as S did.
+        last_S, last_rss = self._last_rss
+        if S and S[:-1] == last_S and S[-1] in last_rss:
+            current_rss = last_rss[S[-1]]
+        else:
+            current_rss = self._val_rss(active, b[:, np.newaxis])[0]
+
+        G_SS = self._G[np.ix_(active, active)]
+        G_Sj = self._G[np.ix_(active, candidates)]
+        A = np.linalg.lstsq(G_SS, G_Sj, rcond=None)[0] if len(active) \
+            else np.zeros((0, len(candidates)))
+        schur = self._G[candidates, candidates] - (G_Sj * A).sum(axis=0)
+        independent = schur > _DEPENDENCE_TOL * np.diag(self._G)[candidates]
+        independent &= ~self._inert[candidates]
+        gamma = np.zeros(len(candidates))
+        gamma[independent] = ((self._c[candidates] - A.T @ self._c[active])
+                              [independent] / schur[independent])
+
+        # The fit of S + [j] has coefficients U_j = b - gamma_j * a_j
+        # on S and gamma_j on j. Expand its validation residual sum of
+        # squares, as in `_val_rss()`, for all candidates at once.
+        v = self._val
+        U = b[:, np.newaxis] - A * gamma
+        intercepts = (self._mean_y - self._mean_x[active] @ U
+                      - self._mean_x[candidates] * gamma)
+        offset = (v.mean_y - intercepts - v.mean_x[active] @ U
+                  - v.mean_x[candidates] * gamma)
+        rss = (v.yy - 2 * (U.T @ v.xy[active] + gamma * v.xy[candidates])
+               + (U * (v.xx[np.ix_(active, active)] @ U)).sum(axis=0)
+               + 2 * gamma * (U * v.xx[np.ix_(active, candidates)]).sum(axis=0)
+               + gamma ** 2 * v.xx[candidates, candidates]
+               + v.n * offset ** 2)
+        rss[~independent] = current_rss
+        self._last_rss = (list(S), dict(zip(candidates, rss)))
+        return self._scores(rss, k=len(S) + 1)
+
+
+class GramBackward(_GramEngine):
+    """Backward elimination from sufficient statistics.
+
+    Uses the sweep identity of ``BackwardSweep``: dropping column ``i``
+    gives coefficients ``b - G^-1[:, i] * b_i / G^-1[i, i]``.
+
+    """
+
+    def score(self, S, candidates):
+        """Score the model ``S`` less `j` for every `j` in `candidates`.
+
+        Args:
+            S : list
+                The current features.
+            candidates : list
+                The features to drop in turn. None denotes
+                dropping nothing, i.e., scoring `S` itself.
+
+        Returns:
+            scores : ndarray
+                One score per candidate.
+
+        """
+        active = [f for f in S if not self._inert[f]]
+        b = self._solve(active)
+        # Reuse the value computed when the dropped feature
+        # was a candidate, if there is one.
+        last_S, last_rss = self._last_rss
+        feature = _dropped_feature(last_S, S)
+        if feature in last_rss:
+            current_rss = last_rss[feature]
+        else:
+            current_rss = self._val_rss(active, b[:, np.newaxis])[0]
+        position = {f: a for a, f in enumerate(active)}
+
+        G = self._G[np.ix_(active, active)]
+        eigvals, eigvecs = np.linalg.eigh(G)
+        if not len(active) or eigvals[0] > _DEPENDENCE_TOL * eigvals[-1]:
+            G_inv = (eigvecs / eigvals) @ eigvecs.T
+            B = b[:, np.newaxis] - G_inv * (b / np.diag(G_inv))
+            active_rss = self._val_rss(active, B)
+        else:
+            # Collinear: solve each candidate fit directly.
+            active_rss = np.empty(len(active))
+            for i in range(len(active)):
+                keep = active[:i] + active[i + 1:]
+                B = np.insert(self._solve(keep), i, 0)
+                active_rss[i] = self._val_rss(active, B[:, np.newaxis])[0]
+
+        rss = np.array([current_rss if j is None or j not in position
+                        else active_rss[position[j]] for j in candidates])
+        self._last_rss = (list(S), {j: r for j, r in zip(candidates, rss)
+                                    if j is not None})
+        k = np.array([len(S) if j is None else len(S) - 1 for j in candidates])
+        return self._scores(rss, k=k)
@@ -4,6 +4,29 @@
 Utils
 =====
 """
+import os
+
+import numpy as np
+
+
+def load_array(data):
+    """Open `data` if it is a path to a ``.npy`` file.
+
+    Args:
+        data : ndarray, str or os.PathLike
+            An array, or the path to one saved with ``np.save()``.
+
+    Returns:
+        ndarray
+            `data` 'as is' if it is not a path. Otherwise, the file is
+            opened as a read-only ``np.memmap``, i.e., nothing is read
+            until it is needed.
+
+    """
+    if isinstance(data, (str, os.PathLike)):
+        return np.load(data, mmap_mode='r')
+    return data
+
 
 def get_n_features(matrix, min_=2):
     """Get the number of features in a matrix.
@@ -32,25 +55,6 @@ def get_n_features(matrix, min_=2):
     return n_features
 
 
-def enforce_use_of_all_cpus(model):
-    """For sklearn models which have an `n_jobs` attribute,
-    set to -1. This will force all cores on the machine to be
-    used.
-
-    Args:
-        model : sklearn model
-            A trainable sklearn model
-
-    Returns:
-        model : sklearn model
-            Model 'as is' with `n_jobs` set to one if it
-            exists
-
-    """
-    setattr(model, 'n_jobs', -1)
-    return model
-
-
 def parse_n_features(n_features, total):
     """Parse either the `n_features` for forward
     and backward selection. Namely
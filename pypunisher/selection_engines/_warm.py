@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+Warm Starts
+===========
+Start fitting a candidate from the coefficients of the current model.
+"""
+from copy import deepcopy
+from inspect import signature
+
+import numpy as np
+
+
+def supports_warm_start(model):
+    """Whether `model` declares a ``warm_start`` parameter."""
+    return 'warm_start' in model.get_params(deep=False)
+
+
+def _takes_initial_coef(model):
+    """Whether `model.fit()` takes ``coef_init`` and ``intercept_init``
+    (e.g., ``SGDRegressor``, ``SGDClassifier`` or ``Perceptron``), here
+    or in a base class (as a subclass's ``fit(X, y, **kwargs)`` would)."""
+    for cls in type(model).__mro__:
+        if 'fit' in vars(cls):
+            parameters = signature(vars(cls)['fit']).parameters
+            if 'coef_init' in parameters and 'intercept_init' in parameters:
+                return True
+    return False
+
+
+class WarmStart(object):
+    """The coefficients of a fitted linear model, by feature.
+
+    Candidates differ from the current model by a feature or two, so
+    their optimisation can start from its coefficients rather than from
+    scratch: those of shared features are carried over, and those of new
+    features start at zero. Estimators whose ``fit()`` takes ``coef_init``
+    and ``intercept_init`` (e.g., ``SGDRegressor``) are passed them, as
+    their state holds more than ``coef_`` (e.g., the averages of
+    ``average=True``). The rest rely on their ``warm_start`` parameter,
+    under which they resume from ``coef_`` and ``intercept_`` (e.g.,
+    ``LogisticRegression`` or ``ElasticNet``).
+
+    Args:
+        model : sklearn model
+            A model fitted on `features`, with ``coef_`` and ``intercept_``.
+        features : list
+            The columns `model` was fitted on.
+
+    """
+
+    def __init__(self, model, features):
+        self.features = list(features)
+        self._coef = np.array(model.coef_, dtype=float)
+        self._intercept = deepcopy(model.intercept_)
+
+    @staticmethod
+    def available(model):
+        """Whether the fitted `model` has coefficients to start from."""
+        return hasattr(model, 'coef_') and hasattr(model, 'intercept_')
+
+    def prime(self, model, features):
+        """Set `model` to start its next fit, on `features`,
+        from these coefficients.
+
+        Args:
+            model : sklearn model
+                A model which declares ``warm_start``. It may be
+                modified in place.
+            features : list
+                The columns `model` is about to be fitted on.
+
+        Returns:
+            fit_params : dict
+                Keyword arguments to pass to ``model.fit()``.
+
+        """
+        position = {f: i for i, f in enumerate(self.features)}
+        index = np.array([position.get(f, -1) for f in features], dtype=int)
+        coef = np.where(index >= 0, self._coef[..., index], 0.)
+        if _takes_initial_coef(model):
+            return {'coef_init': coef, 'intercept_init': deepcopy(self._intercept)}
+        model.set_params(warm_start=True)
+        model.coef_ = coef
+        model.intercept_ = deepcopy(self._intercept)
+        return dict()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+"""
+Selection Paths
+===============
+Record a complete greedy path once, and read any selection off it.
+"""
+import numpy as np
+
+from pypunisher._checks import input_checks
+from pypunisher.selection_engines._utils import parse_n_features
+
+
+class SelectionPath(object):
+    """The complete path of forward or backward selection.
+
+    Greedy paths are nested: ``forward()`` with a larger ``n_features``
+    (or a smaller ``min_change``) continues the path of a smaller one, and
+    likewise for ``backward()``. A path, as made by ``Selection.forward_path()``
+    or ``Selection.backward_path()``, holds every step, so that the
+    selection for any ``n_features`` or ``min_change`` is read off it
+    without fitting anything.
+
+    Args:
+        algorithm : str
+            One of: 'forward', 'backward'.
+        columns : 1d array of ints
+            The search space: the columns of ``X_train`` selection
+            started from (all of which a backward path starts with).
+        features : 1d array of ints
+            The feature added (or dropped) at each step.
+        scores : 1d array of floats
+            The score of the model after each step.
+        candidate_scores : 2d array of floats
+            The score of every candidate (column of ``X_train``) at each
+            step, NaN if a column was not a candidate or not scored (e.g.,
+            by ``shortlist``, ``lazy`` or ``halving``), and -inf if it was
+            rejected by ``racing``.
+        initial_score : float
+            The score of the model before the first step (backward
+            paths only), otherwise NaN.
+
+    """
+
+    def __init__(self, algorithm, columns, features, scores,
+                 candidate_scores, initial_score=np.nan):
+        if algorithm not in ('forward', 'backward'):
+            raise ValueError("`algorithm` must be one of: 'forward', 'backward'.")
+        self.algorithm = algorithm
+        self.columns = np.asarray(columns, dtype=np.int64)
+        self.features = np.asarray(features, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.candidate_scores = np.asarray(candidate_scores, dtype=np.float64)
+        self.initial_score = float(initial_score)
+
+    def __len__(self):
+        return len(self.features)
+
+    def __repr__(self):
+        return "SelectionPath(algorithm={!r}, steps={})".format(
+            self.algorithm, len(self)
+        )
+
+    def select(self, n_features=None, min_change=None):
+        """Get the features selected with the given
+        `n_features` or `min_change`.
+
+        Args:
+            n_features (int or float)
+                for a forward path, the number of leading features of the
+                path; for a backward path, the number of features to keep.
+                Floats are regarded as proportions of ``columns``.
+            min_change (int or float)
+                as in ``forward()`` or ``backward()``.
+
+        Returns:
+            S (list)
+              The column indices of ``X_train`` (and ``X_val``) that denote
+              the chosen features.
+
+        Raises:
+            if ``n_features`` and ``min_change`` are both non-None.
+
+        """
+        input_checks(locals())
+        total = len(self.columns)
+        if n_features is not None:
+            n_features = parse_n_features(n_features, total=total)
+            n_steps = n_features if self.algorithm == 'forward' \
+                else total - n_features
+            if n_steps > len(self):
+                raise ValueError("The path has only {} steps.".format(len(self)))
+        elif self.algorithm == 'forward':
+            # Forward selection stops once a score falls short of
+            # `min_change`, keeping the feature which scored it.
+            short = np.flatnonzero(self.scores < min_change)
+            n_steps = short[0] + 1 if len(short) else len(self)
+        else:
+            # Backward selection stops once dropping a feature improves
+            # the score by less than `min_change`.
+            before = np.concatenate([[self.initial_score], self.scores[:-1]])
+            short = np.flatnonzero(~(self.scores - before >= min_change))
+            n_steps = short[0] if len(short) else len(self)
+
+        steps = self.features[:n_steps].tolist()
+        if self.algorithm == 'forward':
+            return steps
+        return [c for c in self.columns.tolist() if c not in set(steps)]
+
+    def save(self, file):
+        """Save the path to a compressed ``.npz`` file.
+
+        Args:
+            file : str or file-like
+                As in ``np.savez_compressed()``.
+
+        """
+        np.savez_compressed(
+            file, algorithm=np.array(self.algorithm), columns=self.columns,
+            features=self.features, scores=self.scores,
+            candidate_scores=self.candidate_scores,
+            initial_score=np.array(self.initial_score)
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Load a path saved with ``save()``.
+
+        Args:
+            file : str or file-like
+                As in ``np.load()``.
+
+        Returns:
+            SelectionPath
+
+        """
+        with np.load(file, allow_pickle=False) as data:
+            return cls(algorithm=str(data['algorithm']), columns=data['columns'],
+                       features=data['features'], scores=data['scores'],
+                       candidate_scores=data['candidate_scores'],
+                       initial_score=float(data['initial_score']))
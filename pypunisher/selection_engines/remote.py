@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+
+"""
+Remote Workers
+==============
+Fit candidate models on other machines, over TCP.
+
+Start a worker on each machine:
+
+    python -m pypunisher.selection_engines.remote --host 0.0.0.0 --port 5000
+
+then pass a ``RemotePool`` of their addresses to ``Selection`` as its
+``executor``. Arrays are shipped to each worker once; thereafter, tasks
+carry only the model, the feature subsets and the scores. Workers drop
+an array once the coordinator no longer holds it.
+
+Warning: messages are pickled, so a worker runs whatever it is sent.
+Only expose workers to trusted networks.
+"""
+import argparse
+import pickle
+import queue
+import socket
+import struct
+import threading
+import traceback
+import weakref
+from concurrent.futures import Future
+
+import numpy as np
+
+_HEADER = struct.Struct('!Q')  # the length of each message
+
+
+def _no_delay(sock):
+    """Send small messages at once (tasks and replies alternate)."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _send(sock, obj):
+    """Send a pickled, length-prefixed `obj`."""
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)))
+    sock.sendall(data)
+
+
+def _recv_exactly(sock, size):
+    buffer = bytearray(size)
+    view, received = memoryview(buffer), 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise EOFError("Connection closed.")
+        received += n
+    return buffer
+
+
+def _recv_bytes(sock):
+    """Receive the pickled object sent with ``_send()``."""
+    size, = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return _recv_exactly(sock, size)
+
+
+class _ArrayRef(object):
+    """Stands in for an array which the worker already holds."""
+
+    def __init__(self, token):
+        self.token = token
+
+
+def _resolve(obj, arrays):
+    """Replace the ``_ArrayRef``s in `obj` (or its tuples) with arrays."""
+    if isinstance(obj, _ArrayRef):
+        return arrays[obj.token]
+    if isinstance(obj, tuple):
+        return tuple(_resolve(o, arrays) for o in obj)
+    return obj
+
+
+def _refs(obj):
+    """The ``_ArrayRef``s in `obj` (or its tuples)."""
+    if isinstance(obj, _ArrayRef):
+        return [obj]
+    if isinstance(obj, tuple):
+        return [r for o in obj for r in _refs(o)]
+    return list()
+
+
+class Worker(object):
+    """Run the tasks of one coordinator at a time.
+
+    Args:
+        host : str
+            The interface to listen on. Defaults to '127.0.0.1'.
+        port : int
+            The port to listen on. If 0, any free port.
+            Defaults to 0.
+
+    Attributes:
+        address : tuple
+            The ``(host, port)`` listened on.
+
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        family = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self.address = self._server.getsockname()[:2]
+
+    def serve_forever(self):
+        """Serve coordinators, one after another, until killed."""
+        while True:
+            connection, _ = self._server.accept()
+            with _no_delay(connection):
+                self._serve(connection)
+
+    @staticmethod
+    def _serve(connection):
+        arrays = dict()  # dropped along with the coordinator.
+        while True:
+            try:
+                message = _recv_bytes(connection)
+            except (EOFError, OSError):
+                return
+            try:
+                message = pickle.loads(message)
+            except Exception as e:  # e.g., a class this worker cannot import.
+                _send(connection, ('error', e))
+                continue
+            if message[0] == 'data':
+                _, token, array = message
+                arrays[token] = array
+                continue
+            if message[0] == 'drop':
+                for token in message[1]:
+                    arrays.pop(token, None)
+                continue
+            _, fn, args = message
+            try:
+                reply = ('ok', fn(*_resolve(args, arrays)))
+            except Exception as e:
+                reply = ('error', e)
+            try:
+                _send(connection, reply)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                _send(connection, ('error', RuntimeError(traceback.format_exc())))
+
+
+class RemotePool(object):
+    """An executor which runs tasks on ``Worker``s.
+
+    Each worker is driven by a thread which takes tasks from a shared
+    queue, so faster workers take more tasks. Array arguments (including
+    those inside tuples) are sent to each worker only once, and dropped
+    by the workers once the array is garbage collected here (e.g., the
+    subsamples of ``halving``). If a worker dies or its connection drops,
+    its unfinished task is returned to the queue for the remaining workers.
+    If no worker remains, outstanding tasks fail with a ``ConnectionError``.
+    Tasks which cannot be pickled fail without affecting the worker.
+
+    Args:
+        addresses : list of tuples
+            The ``(host, port)`` of each worker.
+
+    """
+
+    def __init__(self, addresses):
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._tokens = dict()  # id(array) -> token, while the array lives
+        self._live = dict()  # token -> weak reference to the array
+        self._next_token = 0
+        self._alive = len(addresses)
+        self._threads = [threading.Thread(target=self._drive, args=(tuple(a),),
+                                          daemon=True) for a in addresses]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def n_workers(self):
+        """The number of workers still connected."""
+        return self._alive
+
+    def _ref(self, obj, held):
+        """Replace the arrays in `obj` (or its tuples) with ``_ArrayRef``s,
+        holding them in `held` (by token) until the task is sent."""
+        if isinstance(obj, np.ndarray):
+            with self._lock:
+                token = self._tokens.get(id(obj))
+                if token is None:
+                    token = self._tokens[id(obj)] = self._next_token
+                    self._next_token += 1
+                    self._live[token] = weakref.ref(obj, self._release(id(obj), token))
+            held[token] = obj
+            return _ArrayRef(token)
+        if isinstance(obj, tuple):
+            return tuple(self._ref(o, held) for o in obj)
+        return obj
+
+    def _release(self, key, token):
+        """A callback which forgets an array once it is garbage collected.
+
+        It runs as the array is freed, and so before its ``id()``
+        can be reused. Workers drop it before their next task.
+        """
+        tokens, live = self._tokens, self._live
+
+        def release(_):
+            if tokens.get(key) == token:
+                tokens.pop(key, None)
+            live.pop(token, None)
+        return release
+
+    def submit(self, fn, *args):
+        """Schedule ``fn(*args)`` on a worker.
+
+        Returns:
+            concurrent.futures.Future
+
+        """
+        future, held = Future(), dict()
+        args = tuple(self._ref(a, held) for a in args)
+        with self._lock:  # so that `_lost()` cannot miss the task.
+            if self._alive:
+                self._tasks.put((future, fn, args, held))
+            else:
+                future.set_exception(ConnectionError("All workers were lost."))
+        return future
+
+    def _lost(self):
+        """Record the loss of a worker, failing all tasks if it was the last."""
+        with self._lock:
+            self._alive -= 1
+            if self._alive:
+                return
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if task is not None:
+                task[0].set_exception(ConnectionError("All workers were lost."))
+
+    def _drive(self, address):
+        try:
+            sock = _no_delay(socket.create_connection(address))
+        except OSError:
+            return self._lost()
+        sent = set()  # the tokens of the arrays this worker holds.
+        with sock:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    return
+                future, fn, args, held = task
+                if not future.running() and not future.set_running_or_notify_cancel():
+                    continue  # cancelled before it started.
+                try:
+                    with self._lock:
+                        stale = sent.difference(self._live)
+                    if stale:
+                        _send(sock, ('drop', stale))
+                        sent -= stale
+                    for ref in _refs(args):
+                        if ref.token not in sent:
+                            _send(sock, ('data', ref.token, held[ref.token]))
+                            sent.add(ref.token)
+                    try:
+                        # Pickled in full before anything is sent, so
+                        # a failure leaves the connection usable.
+                        _send(sock, ('task', fn, args))
+                    except (pickle.PicklingError, TypeError, AttributeError) as e:
+                        future.set_exception(e)
+                        continue
+                    reply = _recv_bytes(sock)
+                except (EOFError, OSError):
+                    self._tasks.put(task)  # for another worker.
+                    return self._lost()
+                try:
+                    status, result = pickle.loads(reply)
+                except Exception as e:
+                    status, result = 'error', e
+                if status == 'ok':
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+
+    def shutdown(self, wait=True):
+        """Disconnect from the workers (which keep running)."""
+        for _ in self._threads:
+            self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run a PyPunisher worker.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    options = parser.parse_args()
+    worker = Worker(options.host, port=options.port)
+    print("Serving on {}:{}".format(*worker.address), flush=True)
+    worker.serve_forever()
@@ -4,13 +4,52 @@
 Forward and Backward Selection Algorithms
 =========================================
 """
+import asyncio
+import heapq
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from joblib.externals.loky import get_reusable_executor
+from sklearn.base import clone, is_classifier, is_regressor
+from sklearn.linear_model import LinearRegression
 
-from pypunisher.metrics.criterion import aic, bic
 from pypunisher._checks import model_check, array_check, input_checks
+from pypunisher.selection_engines._buffer import ColumnBuffer
+from pypunisher.selection_engines._cancellation import CancelScope
+from pypunisher.selection_engines._cache import (ScoreCache, DiskScoreCache,
+                                                 fingerprint, subset_key)
+from pypunisher.selection_engines._linear import (ForwardQR, BackwardSweep,
+                                                  supports_linear_engine)
+from pypunisher.selection_engines._shared import SharedArrays
+from pypunisher.selection_engines._screening import (preflight_columns,
+                                                     residual_correlations,
+                                                     subsample_order,
+                                                     sure_independence_screen,
+                                                     top_candidates)
+from pypunisher.selection_engines._streaming import (SufficientStatistics,
+                                                     GramForward, GramBackward)
+from pypunisher.selection_engines._parallel import (_limited_fit_and_score,
+                                                    executor_fit_and_score,
+                                                    fit_and_score,
+                                                    parallel_fit_and_score,
+                                                    score_fitted)
+from pypunisher.selection_engines._racing import Race
+from pypunisher.selection_engines._speculation import Speculator
+from pypunisher.selection_engines._warm import WarmStart, supports_warm_start
+from pypunisher.selection_engines._scheduler import (CpuBudget, CpuPlan,
+                                                     blas_limits,
+                                                     declares_n_jobs)
+from pypunisher.selection_engines.path import SelectionPath
 from pypunisher.selection_engines._utils import (get_n_features,
-                                                 enforce_use_of_all_cpus,
+                                                 load_array,
                                                  parse_n_features)
 
+# A decision of ``forward_steps()`` or ``backward_steps()``.
+Step = namedtuple('Step', ['feature', 'score', 'elapsed'])
+
 
 class Selection(object):
     """Forward and Backward Selection Algorithms.
@@ -27,6 +66,12 @@ class Selection(object):
             a 2D numpy array of (observations, features).
         y_val (1d ndarray)
             a 1D array of target classes for X_validate.
+
+            Note: each of the arrays may also be a ``np.memmap`` or the
+            path to a ``.npy`` file, which is opened as a read-only
+            ``np.memmap``. Memory-mapped data are not loaded in full:
+            candidate models read only the columns they use, and the
+            linear engines process rows in blocks.
         criterion (str or None)
             model selection criterion.
 
@@ -39,26 +84,470 @@ class Selection(object):
         verbose (bool)
             if True, print additional information as selection occurs.
             Defaults to True.
+        n_jobs (int or str)
+            number of candidate models to fit concurrently in each
+            iteration. Each concurrent candidate is fitted on a clone
+            of ``model``. ``-1`` uses every core of ``n_cpus``. If 'auto',
+            chosen along with the split of ``n_cpus`` described there.
+            Defaults to 1 (serial).
+        n_cpus (int or None)
+            the number of cores selection may use. If None, all of them.
+            The cores are split between concurrent candidates (``n_jobs``),
+            the ``n_jobs`` parameter of ``model`` (only if it declares one)
+            and native (BLAS/OpenMP) thread pools. The split is planned once,
+            from timed fits of a candidate: serially, with every core given
+            to ``model.n_jobs`` (unless ``model`` warns that it ignores it)
+            and with every core given to native threads. With ``n_jobs=1``,
+            there is nothing to split: each candidate is given every core,
+            through ``model.n_jobs`` (if declared) and native threads, without
+            timing anything. ``model`` itself is never modified; a planned
+            ``n_jobs`` is set on a clone. Defaults to None.
+        backend (str)
+            the ``joblib`` backend used for concurrent candidates,
+            e.g., 'loky', 'threading' or 'multiprocessing'.
+            Defaults to 'loky'.
+        engine (str)
+            how candidate models are scored.
+
+            * 'auto': use a closed-form least squares engine if ``model``
+              is recognised as ``LinearRegression``, otherwise fit each
+              candidate with ``model``.
+
+            * 'generic': always fit each candidate with ``model``.
+
+            Defaults to 'auto'.
+        cache_size (int or None)
+            if an int, remember the scores of up to this many feature
+            subsets, evicting the least recently used. The cache is shared
+            by all ``forward()`` and ``backward()`` calls on this instance.
+            If None, scores are not cached. Defaults to None.
+        cache_file (str or None)
+            path to a file in which scores are persisted across runs and
+            processes. Scores are only reused if the data, the model's class
+            and parameters and ``criterion`` all match. If ``cache_size`` is
+            None, all scores read from the file are held in memory.
+            Defaults to None.
+        shortlist (int or None)
+            if an int, each iteration of ``forward()`` only scores this many
+            of the remaining features: those most correlated with the
+            residuals of the current model on the training data (a single
+            matrix product). Requires a regressor. If None, every
+            remaining feature is scored. Defaults to None.
+        lazy (bool)
+            if True, ``forward()`` uses lazy greedy evaluation: features are
+            kept in a priority queue keyed by the improvement they gave when
+            last scored, and only the top of the queue is re-scored until a
+            freshly scored feature stays on top. The first two iterations
+            score every feature. This is exact (i.e., selects the same
+            features as the exhaustive search) only if gains are diminishing,
+            that is, if no feature improves the score more once other
+            features have been added. Otherwise, it is a heuristic.
+            Cannot be combined with ``shortlist``, ``halving`` or ``racing``.
+            See ``stats()``. Defaults to False.
+        halving (int or None)
+            if an int, each iteration of ``forward()`` and ``backward()``
+            narrows down the candidates by successive halving: every
+            candidate is fitted on a random subsample of this many training
+            rows (stratified by class, for classifiers), the best
+            ``1 / halving_factor`` of them are refitted on a subsample
+            ``halving_factor`` times larger, and so on, until one candidate
+            remains or the subsample would cover ``X_train``.
+            Candidates are always scored against the full validation data,
+            and the remaining candidates are then scored as usual, on the
+            full training data, so the decision of each iteration always
+            rests on full-data scores. Only used when candidates are fitted
+            with ``model`` (i.e., not by the closed-form engines).
+            See ``stats()``. Defaults to None.
+        halving_factor (int or float)
+            the reduction factor of ``halving``. Must exceed 1.
+            Defaults to 3.
+        racing (float or None)
+            if a float, the confidence level (e.g., 0.999) at which candidate
+            models are rejected early. Candidates are fitted one at a time
+            and their squared validation residuals accumulated in blocks of
+            rows; a candidate is rejected as soon as a confidence bound on
+            its mean (paired) difference from the best candidate so far shows
+            it cannot win. Rejected candidates are not scored (nor cached);
+            the others receive their usual score, under any ``criterion``.
+            Requires a regressor, and only used when candidates are fitted
+            serially (see ``n_jobs``), without ``executor``. Cannot be
+            combined with ``lazy``. See ``stats()``. Defaults to None.
+        executor (concurrent.futures.Executor or None)
+            if given, the candidate fits of each iteration are dispatched
+            through it, in place of ``n_jobs``, ``backend`` and ``n_cpus``.
+            Any object with a ``submit(fn, *args)`` method returning a future
+            will do, e.g., a ``ThreadPoolExecutor``, a ``ProcessPoolExecutor``,
+            a ``RemotePool`` of workers on other machines (see
+            ``pypunisher.selection_engines.remote``) or an in-house executor.
+            The executor is not shut down by selection. Defaults to None.
+        batch_size (int or None)
+            the number of candidates fitted by each task sent to
+            ``executor``, which amortises the cost of dispatch on cheap
+            models. If None, each iteration's candidates are split into
+            about four tasks per worker (``executor.n_workers``, if defined)
+            or else per core of ``n_cpus``. Defaults to None.
+        shared_data (bool or None)
+            if True, worker processes open a single, memory-mapped copy of
+            the data (written once, to ``/dev/shm`` where available, or
+            referred to by path if already memory-mapped, e.g., a ``.npy``
+            file or an ``np.memmap``), so tasks carry only feature indices.
+            If None, this is done for process-based execution: a
+            ``ProcessPoolExecutor``, or the 'loky' and 'multiprocessing'
+            backends. See ``close()``. Defaults to None.
+        speculate (int or None)
+            if an int, ``forward()`` speculates on this many leaders: once
+            workers fall idle at the tail of an iteration, the candidates of
+            the next iteration are started for each of the best candidates
+            scored so far. Work for the leader which is then selected is
+            kept; the rest is cancelled (or discarded). Results are identical
+            to those of ``forward()`` without speculation. Candidates are
+            fitted one per task, through ``executor`` (whose futures must be
+            ``concurrent.futures.Future``s) or else ``n_jobs`` workers of
+            ``backend``, so this pays off only with more than one worker.
+            Only used when candidates are fitted with ``model``. Cannot be
+            combined with ``lazy`` or ``racing``. See ``stats()``.
+            Defaults to None.
+        warm_start (bool)
+            if True, candidate fits start from the coefficients of the
+            current model (i.e., the model on the features selected so far,
+            fitted once per iteration), carried over for shared features
+            and zero for the feature added, in place of starting from
+            scratch. For iterative estimators which declare ``warm_start``
+            and expose ``coef_`` and ``intercept_`` (e.g.,
+            ``LogisticRegression`` or ``ElasticNet``), this cuts the
+            iterations to convergence. Estimators whose ``fit()`` takes
+            ``coef_init`` (e.g., ``SGDRegressor``) are passed the
+            coefficients instead, though their learning rate schedule
+            starts afresh. Otherwise, candidates are fitted from scratch. Scores (and so, rarely, the features
+            selected) may differ within the solver's tolerance from those of
+            cold starts. ``model`` itself is not modified. Cannot be combined
+            with ``speculate``. Defaults to False.
+        prefilter (int or None)
+            if an int, screen the features once, at construction, and only
+            search over the survivors: constant and duplicate columns are
+            dropped and, of the rest, the ``prefilter`` columns with the
+            largest absolute correlation with ``y_train`` are kept (sure
+            independence screening). The data are read in blocks of rows.
+            Returned features always use the column numbering of ``X_train``.
+            Requires a regressor. See ``dropped_features()``.
+            Defaults to None.
+        preflight (bool)
+            if True, exclude from the search space, at construction, every
+            column of ``X_train`` which is constant, an exact duplicate of an
+            earlier column (found by hashing) or numerically collinear with
+            earlier columns and the intercept (found by a rank-revealing
+            Cholesky factorization of the Gram matrix). Such columns cannot
+            improve a linear fit. Runs before ``prefilter``.
+            See ``dropped_features()``. Defaults to False.
 
     """
 
     def __init__(self, model, X_train, y_train,
-                 X_val, y_val, criterion=None, verbose=True):
+                 X_val, y_val, criterion=None, verbose=True,
+                 n_jobs=1, backend='loky', engine='auto', cache_size=None,
+                 cache_file=None, shortlist=None, prefilter=None,
+                 preflight=False, lazy=False, halving=None,
+                 halving_factor=3, racing=None, n_cpus=None, executor=None,
+                 batch_size=None, shared_data=None, speculate=None,
+                 warm_start=False):
         model_check(model)
-        self._model = enforce_use_of_all_cpus(model)
+        self._model = model
 
-        self._X_train = X_train
-        self._y_train = y_train
-        self._X_val = X_val
-        self._y_val = y_val
+        self._X_train = X_train = load_array(X_train)
+        self._y_train = y_train = load_array(y_train)
+        self._X_val = X_val = load_array(X_val)
+        self._y_val = y_val = load_array(y_val)
         array_check(self)
 
+        if engine not in ('auto', 'generic'):
+            raise ValueError("`engine` must be one of: 'auto', 'generic'.")
+        self._linear = engine == 'auto' and supports_linear_engine(model, y_train)
+        self._engines = dict()
+
+        if executor is not None and not callable(getattr(executor, 'submit', None)):
+            raise AttributeError("`executor` does not contain a submit method")
+        if batch_size is not None and (not isinstance(batch_size, int)
+                                       or batch_size < 1):
+            raise ValueError("`batch_size` must be a positive int or None.")
+        if shared_data not in (None, True, False):
+            raise ValueError("`shared_data` must be a bool or None.")
+        self._executor = executor
+        self._batch_size = batch_size
+        self._shared_data = shared_data
+        self._shared = None
+
+        self._configure(
+            criterion, verbose=verbose, n_jobs=n_jobs, n_cpus=n_cpus,
+            backend=backend,
+            cache_size=cache_size, cache_file=cache_file, shortlist=shortlist,
+            lazy=lazy, halving=halving, halving_factor=halving_factor,
+            racing=racing, n_features=get_n_features(X_train),
+            data=(X_train, y_train, X_val, y_val)
+        )
+
+        if speculate is not None and (not isinstance(speculate, int)
+                                      or speculate < 1):
+            raise ValueError("`speculate` must be a positive int or None.")
+        if speculate is not None and (lazy or racing is not None):
+            raise ValueError("`speculate` cannot be combined with "
+                             "`lazy` or `racing`.")
+        self._speculate = speculate
+        self._speculator = self._speculation_pool = None
+        self._scope = self._trace = None
+
+        if not isinstance(warm_start, bool):
+            raise ValueError("`warm_start` must be a bool.")
+        if warm_start and not supports_warm_start(model):
+            raise ValueError("`warm_start` requires a model "
+                             "with a `warm_start` parameter.")
+        if warm_start and speculate is not None:
+            raise ValueError("`warm_start` cannot be combined with `speculate`.")
+        self._warm_start = warm_start
+        self._warm = self._warm_model = None
+
+        if preflight:
+            self._dropped.update(preflight_columns(X_train, self._features))
+            self._features = [f for f in self._features if f not in self._dropped]
+        if prefilter is not None:
+            if not isinstance(prefilter, int) or prefilter < 1:
+                raise ValueError("`prefilter` must be a positive int or None.")
+            # Correlations are only defined for a numeric response.
+            if not is_regressor(self._model):
+                raise ValueError("`prefilter` requires a regressor.")
+            self._features, dropped = sure_independence_screen(
+                X_train, y_train, columns=self._features, size=prefilter
+            )
+            self._dropped.update(dropped)
+        if len(self._features) < 2:
+            raise IndexError("less than 2 features survived "
+                             "`preflight` and `prefilter`.")
+
+    @classmethod
+    def from_blocks(cls, train_blocks, val_blocks, criterion=None,
+                    fit_intercept=True, verbose=True, cache_size=None,
+                    cache_file=None, lazy=False):
+        """Set up selection for ``LinearRegression`` from streamed data.
+
+        The blocks are read once, and only the sufficient statistics of
+        least squares (``X'X``, ``X'y``, ``y'y``, the means and the row
+        count) are kept. Selection then runs entirely on these statistics,
+        so memory is proportional to the square of the number of features,
+        however many rows are streamed.
+
+        Args:
+            train_blocks (iterable)
+                yields ``(X, y)`` tuples of training rows, where ``X`` is a
+                2D array of (observations, features) and ``y`` a 1D array.
+            val_blocks (iterable)
+                yields ``(X, y)`` tuples of validation rows.
+            criterion (str or None)
+                as in ``Selection``.
+            fit_intercept (bool)
+                whether the linear model fits an intercept.
+                Defaults to True.
+            verbose (bool)
+                as in ``Selection``.
+            cache_size (int or None)
+                as in ``Selection``.
+            cache_file (str or None)
+                as in ``Selection``.
+            lazy (bool)
+                as in ``Selection``.
+
+        Returns:
+            Selection
+                An instance on which ``forward()`` and ``backward()``
+                may be called as usual.
+
+        """
+        train = SufficientStatistics.from_blocks(train_blocks)
+        val = SufficientStatistics.from_blocks(val_blocks)
+        if train.xy.shape != val.xy.shape:
+            raise ValueError("Training and validation blocks must have "
+                             "the same number of features.")
+
+        self = cls.__new__(cls)
+        self._model = LinearRegression(fit_intercept=fit_intercept)
+        self._X_train = self._y_train = self._X_val = self._y_val = None
+        self._linear = True
+        self._executor = self._batch_size = self._shared = None
+        self._speculate = self._speculator = self._speculation_pool = None
+        self._scope = self._trace = None
+        self._warm_start, self._warm = False, None
+        engine_kwargs = dict(train=train, val=val, fit_intercept=fit_intercept,
+                             criterion=criterion)
+        self._engines = {'forward': GramForward(**engine_kwargs),
+                         'backward': GramBackward(**engine_kwargs)}
+
+        self._configure(
+            criterion, verbose=verbose, n_jobs=1, n_cpus=None, backend=None,
+            cache_size=cache_size, cache_file=cache_file, shortlist=None,
+            lazy=lazy, halving=None, halving_factor=3, racing=None,
+            n_features=get_n_features(train.xx),
+            data=train.arrays() + val.arrays()
+        )
+        return self
+
+    def _configure(self, criterion, verbose, n_jobs, n_cpus, backend, cache_size,
+                   cache_file, shortlist, lazy, halving, halving_factor,
+                   racing, n_features, data):
+        """Validate and store the settings shared by all constructors.
+
+        Args:
+            criterion, verbose, n_jobs, n_cpus, backend, cache_size, cache_file,
+            shortlist, lazy, halving, halving_factor, racing
+                See ``Selection``.
+            n_features : int
+                The total number of features.
+            data : tuple of ndarrays
+                The data which determine the score of a subset
+                (digested to key the ``cache_file``).
+
+        """
         if criterion not in (None, 'aic', 'bic'):
             raise ValueError("`criterion` must be one of: None, 'aic', 'bic'.")
+        if n_jobs != 'auto' and (not isinstance(n_jobs, int) or n_jobs == 0):
+            raise ValueError("`n_jobs` must be a non-zero int or 'auto'.")
+        if n_cpus is not None and (not isinstance(n_cpus, int) or n_cpus < 1):
+            raise ValueError("`n_cpus` must be a positive int or None.")
+        if shortlist is not None:
+            if not isinstance(shortlist, int) or shortlist < 1:
+                raise ValueError("`shortlist` must be a positive int or None.")
+            # Residuals are only defined for a numeric response.
+            if not is_regressor(self._model):
+                raise ValueError("`shortlist` requires a regressor.")
+        if not isinstance(lazy, bool):
+            raise ValueError("`lazy` must be a bool.")
+        if halving is not None and (not isinstance(halving, int) or halving < 1):
+            raise ValueError("`halving` must be a positive int or None.")
+        if not isinstance(halving_factor, (int, float)) or halving_factor <= 1:
+            raise ValueError("`halving_factor` must be a number greater than 1.")
+        if racing is not None:
+            if not isinstance(racing, float) or not 0 < racing < 1:
+                raise ValueError("`racing` must be a float on (0, 1) or None.")
+            if not is_regressor(self._model):
+                raise ValueError("`racing` requires a regressor.")
+        # A candidate rejected by `racing` has no score to bound
+        # its gain by, so `lazy` could never return to it.
+        if lazy and (shortlist is not None or halving is not None
+                     or racing is not None):
+            raise ValueError("`lazy` cannot be combined with "
+                             "`shortlist`, `halving` or `racing`.")
 
         self._criterion = criterion
+        self._scoring = criterion  # what candidates are scored under.
         self._verbose = verbose
-        self._total_number_of_features = get_n_features(X_train)
+        self._n_jobs = n_jobs
+        self._budget = CpuBudget(n_cpus)
+        self._plan = None
+        self._backend = backend
+        self._total_number_of_features = n_features
+        self._shortlist = shortlist
+        self._lazy = lazy
+        self._halving = halving
+        self._halving_factor = halving_factor
+        self._racing = racing
+        self._stats = Counter()
+        self._features = list(range(n_features))  # the search space
+        self._dropped = dict()
+
+        self._buffer = None
+        self._cache = None if cache_size is None else ScoreCache(cache_size)
+        self._disk_cache = None
+        if cache_file is not None:
+            self._disk_cache = DiskScoreCache(cache_file, fingerprint=fingerprint(
+                self._model, criterion, *data
+            ))
+            if self._cache is None:
+                self._cache = ScoreCache(None)
+            for key, score in self._disk_cache.load():
+                self._cache.put(key, score)
+
+    def close(self):
+        """Remove the shared copy of the data written for worker processes
+        (see ``shared_data``), if any. This also happens when the instance
+        is garbage collected or, at the latest, when the interpreter exits.
+        Selection may continue after ``close()``: a fresh copy is written
+        when next needed. Outstanding speculative work (see ``speculate``)
+        is cancelled, and the working copy of the columns used for large
+        subsets is released.
+
+        """
+        self._stop_speculation()
+        self._buffer = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def dropped_features(self):
+        """Get the features excluded from the search space.
+
+        Returns:
+            dict
+                Maps each excluded column of ``X_train`` to the reason
+                it was excluded: 'constant', 'duplicate', 'collinear'
+                or 'screened'.
+
+        """
+        return dict(self._dropped)
+
+    def stats(self):
+        """Get counters describing the work done by this instance.
+
+        Returns:
+            dict
+                * 'shortlist_skipped': candidate fits avoided by ``shortlist``.
+                * 'lazy_skipped': candidate scores avoided by ``lazy``,
+                  relative to the exhaustive search.
+                * 'halving_eliminated': candidates eliminated by ``halving``
+                  on a subsample, and so never fitted on the full data.
+                * 'racing_rejected': candidates rejected by ``racing``
+                  before being scored on all of the validation data.
+                * 'speculation_hits': candidate scores of ``forward()``
+                  taken from work started by ``speculate``.
+                * 'speculation_wasted': speculative fits whose guess was
+                  wrong. The hit rate of speculation is ``speculation_hits
+                  / (speculation_hits + speculation_wasted)``.
+
+        """
+        return dict(self._stats)
+
+    def cache_info(self):
+        """Get statistics on the score cache.
+
+        Returns:
+            CacheInfo or None
+                A named tuple of ``(hits, misses, maxsize, currsize)``,
+                or None if both ``cache_size`` and ``cache_file`` are None.
+
+        """
+        return None if self._cache is None else self._cache.info()
+
+    @staticmethod
+    def _candidate_features(S, feature, algorithm):
+        """Get the features of a candidate model.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            feature : int or None
+                The feature to add or drop. If None, `S`
+                is returned 'as is'.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            features : list
+                The columns used by the candidate model.
+
+        """
+        if feature is None:
+            return S
+        elif algorithm == 'forward':
+            return S + [feature]
+        else:
+            return [f for f in S if f != feature]
 
     def _fit_and_score(self, S, feature, algorithm):
         """Fit and score the model
@@ -76,22 +565,556 @@ class Selection(object):
             The score of the model.
 
         """
-        if algorithm == 'forward':
-            features = S + [feature]
+        self._checkpoint()
+        features = self._candidate_features(S, feature, algorithm)
+        model, fit_params = self._primed_model(self._warm_for(S), features)
+        X_train, X_val = self._X_train, self._X_val
+        # For large subsets, copying the columns for every candidate costs
+        # about as much as the full matrix. Instead, gather them as views
+        # of a (single) working buffer, held for the current run, unless
+        # the data are memory-mapped and so must not be loaded in full.
+        # The views hold the columns in the order of `features`, as does
+        # the model primed above.
+        if (2 * len(features) >= self._total_number_of_features
+                and not isinstance(X_train, np.memmap)):
+            if self._buffer is None:
+                self._buffer = ColumnBuffer(X_train, X_val)
+            X_train, X_val = self._buffer.views(features)
+            features = slice(None)
+        return fit_and_score(model, X_train=X_train,
+                             y_train=self._y_train, X_val=X_val,
+                             y_val=self._y_val, features=features,
+                             criterion=self._scoring, fit_params=fit_params)
+
+    def _score_candidates(self, S, candidates, algorithm):
+        """Score every candidate feature of an iteration, recording
+        the scores if a path is being traced (see ``forward_path()``).
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn. None denotes
+                scoring `S` itself.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            scores : list
+                The score of each candidate, in the order of `candidates`.
+
+        """
+        scores = self._cached_scores(S, candidates, algorithm=algorithm)
+        if self._trace is not None:
+            self._trace.append((list(candidates), list(scores)))
+        return scores
+
+    def _cached_scores(self, S, candidates, algorithm):
+        """Score every candidate feature of an iteration, using
+        cached scores where available.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn. None denotes
+                scoring `S` itself.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            scores : list
+                The score of each candidate, in the order of `candidates`.
+
+        """
+        if self._cache is None:
+            return self._compute_scores(S, candidates, algorithm=algorithm)
+
+        keys = [subset_key(self._candidate_features(S, j, algorithm),
+                           criterion=self._criterion) for j in candidates]
+        scores = [self._cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            computed = self._compute_scores(
+                S, [candidates[i] for i in missing], algorithm=algorithm
+            )
+            for i, score in zip(missing, computed):
+                scores[i] = float(score)
+                # Remember the scores under other criteria from the same fit.
+                for criterion, other in getattr(score, 'by_criterion', {}).items():
+                    if criterion != self._criterion:
+                        self._cache.put(subset_key(
+                            self._candidate_features(S, candidates[i], algorithm),
+                            criterion=criterion
+                        ), other)
+            # Candidates rejected by `racing` have no score to remember.
+            missing = [i for i in missing if scores[i] != -np.inf]
+            for i in missing:
+                self._cache.put(keys[i], scores[i])
+            if self._disk_cache is not None:
+                self._disk_cache.append([(keys[i], scores[i]) for i in missing])
+        return scores
+
+    def _shortlist_candidates(self, S, candidates):
+        """Narrow `candidates` down to the ``shortlist`` features most
+        correlated with the training residuals of the model on `S`.
+
+        Args:
+            S : list
+                The currently selected features.
+            candidates : list
+                The features which could be added.
+
+        Returns:
+            list
+                The shortlisted candidates, in their original order.
+
+        """
+        if self._shortlist is None or len(candidates) <= self._shortlist:
+            return candidates
+        y_train = np.asarray(self._y_train, dtype=float)
+        if S:
+            self._model.fit(self._X_train[:, S], self._y_train)
+            residual = y_train - self._model.predict(self._X_train[:, S])
         else:
-            features = [f for f in S if f != feature] if feature else S
-        self._model.fit(self._X_train[:, features], self._y_train)
-
-        X_val, y_val = self._X_val[:, features], self._y_val
-        if self._criterion == 'aic':
-            # Note: We want to do selection against the validation
-            # data, hence `X_train=X_val` and `y_train=y_val`.
-            score = aic(self._model, X_train=X_val, y_train=y_val)
-        elif self._criterion == 'bic':
-            score = bic(self._model, X_train=X_val, y_train=y_val)
+            residual = y_train - y_train.mean()
+        correlations = residual_correlations(self._X_train, residual,
+                                             columns=candidates)
+        self._stats['shortlist_skipped'] += len(candidates) - self._shortlist
+        return top_candidates(candidates, correlations, size=self._shortlist)
+
+    def _halve_candidates(self, S, candidates, algorithm):
+        """Narrow `candidates` down by successive halving on growing
+        subsamples of the training rows.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            list
+                The remaining candidates, in their original order.
+
+        """
+        if self._halving is None or self._get_engine(algorithm) is not None:
+            return candidates
+        n = self._X_train.shape[0]
+        # Subsamples are nested: each is a prefix of one fixed permutation,
+        # stratified for classifiers so that every subsample holds every class.
+        order = subsample_order(self._y_train, stratify=is_classifier(self._model))
+        size = self._halving
+        while len(candidates) > 1 and size < n:
+            rows = np.sort(order[:size])
+            subsets = [self._candidate_features(S, feature=j, algorithm=algorithm)
+                       for j in candidates]
+            data = dict(X_train=self._X_train[rows], y_train=self._y_train[rows],
+                        X_val=self._X_val, y_val=self._y_val)
+            plan = None if self._executor is not None \
+                else self._get_plan(S, candidates, algorithm=algorithm)
+            scores = self._fit_subsets(subsets, plan=plan,
+                                       warm=self._warm_for(S), **data)
+            keep = max(1, int(np.ceil(len(candidates) / self._halving_factor)))
+            self._stats['halving_eliminated'] += len(candidates) - keep
+            candidates = top_candidates(candidates, scores, size=keep)
+            size = int(np.ceil(size * self._halving_factor))
+        return candidates
+
+    def _lazy_best_candidate(self, S, heap, best_score):
+        """Find the best feature to add to `S` by lazy evaluation.
+
+        Args:
+            S : list
+                The currently selected features.
+            heap : list
+                A heap of ``(-gain, position, feature, size, score)``
+                entries, one per remaining feature, where `gain` and `score`
+                are those of the feature when it was last scored, against
+                an `S` of length `size`. Updated in place.
+            best_score : float or None
+                The score of `S` (None if `S` is empty).
+
+        Returns:
+            j_score_dict : dict
+                Maps the best feature to its score, if it improves on
+                `best_score`. Otherwise, empty. As in `forward()`.
+
+        """
+        size = len(S)
+        if best_score is None:
+            # Gains are undefined without a score for `S`:
+            # score everything and mark every entry as unbounded.
+            entries = sorted(heap)
+            features = [entry[2] for entry in entries]
+            scores = self._score_candidates(S, candidates=features,
+                                            algorithm='forward')
+            best = int(np.argmax(scores))
+            heap[:] = [(-np.inf, entry[1], entry[2], size, None)
+                       for i, entry in enumerate(entries) if i != best]
+            heapq.heapify(heap)
+            return {features[best]: scores[best]}
+
+        n_scored = 0
+        while heap[0][3] != size:
+            # Re-score every stale entry tied with the top at once
+            # (notably, all unbounded entries), so they can be batched.
+            bound = heap[0][0]
+            stale = [e for e in heap if e[0] == bound and e[3] != size]
+            heap[:] = [e for e in heap if e[0] != bound or e[3] == size]
+            scores = self._score_candidates(S, candidates=[e[2] for e in stale],
+                                            algorithm='forward')
+            for (_, position, j, _, _), score in zip(stale, scores):
+                heap.append((best_score - score, position, j, size, score))
+            heapq.heapify(heap)
+            n_scored += len(stale)
+        self._stats['lazy_skipped'] += len(heap) - n_scored
+
+        # Ties are broken by `position`, i.e., as in the exhaustive search.
+        _, _, best_j, _, best_j_score = heap[0]
+        if best_j_score > best_score:
+            heapq.heappop(heap)
+            return {best_j: best_j_score}
+        return dict()
+
+    def _race_scores(self, S, candidates, algorithm):
+        """Score candidates one at a time, rejecting those which
+        cannot beat the best candidate so far (see ``racing``).
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            scores : list
+                The score of each candidate, in the order of `candidates`.
+                Rejected candidates score ``-inf``.
+
+        """
+        race = Race(self._y_val, confidence=self._racing,
+                    criterion=self._criterion)
+        scores, best = list(), None
+        for j in candidates:
+            self._checkpoint()
+            features = self._candidate_features(S, feature=j, algorithm=algorithm)
+            model, fit_params = self._primed_model(self._warm_for(S), features)
+            model.fit(self._X_train[:, features], self._y_train, **fit_params)
+            squared_residuals = race.run(model, self._X_val, features=features)
+            if squared_residuals is None:
+                self._stats['racing_rejected'] += 1
+                scores.append(-np.inf)
+                continue
+            # Score exactly as without racing, so that ties are unaffected.
+            score = score_fitted(model, X_val=self._X_val[:, features],
+                                 y_val=self._y_val, criterion=self._scoring)
+            if best is None or score > best:
+                best = score
+                race.crown(squared_residuals)
+            scores.append(score)
+        return scores
+
+    def _get_engine(self, algorithm):
+        """Get the closed-form engine for `algorithm`, building it
+        on first use.
+
+        Args:
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            engine or None
+                None if ``model`` is not scored in closed form.
+
+        """
+        if not self._linear:
+            return None
+        if algorithm not in self._engines:
+            engine = ForwardQR if algorithm == 'forward' else BackwardSweep
+            self._engines[algorithm] = engine(
+                self._X_train, y_train=self._y_train, X_val=self._X_val,
+                y_val=self._y_val, fit_intercept=self._model.fit_intercept,
+                criterion=self._criterion
+            )
+        return self._engines[algorithm]
+
+    def _get_plan(self, S, candidates, algorithm):
+        """Get the split of the CPU budget, planning it on first use
+        from timed fits of the first candidate.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            CpuPlan
+
+        """
+        if self._plan is None:
+            features = self._candidate_features(S, candidates[0], algorithm)
+            n_jobs_declared = declares_n_jobs(self._model)
+            probe = clone(self._model)  # the model passed in is left as is.
+
+            def fit(n_jobs):
+                if n_jobs_declared:
+                    probe.set_params(n_jobs=n_jobs)
+                probe.fit(self._X_train[:, features], self._y_train)
+
+            outer = None if self._n_jobs == 'auto' \
+                else self._budget.outer(self._n_jobs)
+            self._plan = self._budget.plan(fit, n_candidates=len(candidates),
+                                           n_jobs_declared=n_jobs_declared,
+                                           outer=outer)
+            n_jobs = self._plan.n_jobs
+            if n_jobs is not None and n_jobs != (self._model.n_jobs or 1):
+                # Candidates are fitted with the planned `n_jobs`,
+                # on a copy of the model passed in.
+                self._model = clone(self._model).set_params(n_jobs=n_jobs)
+                self._warm_model = None
+            if self._verbose:
+                print("CPU plan: {}".format(self._plan))
+        return self._plan
+
+    def _share_with(self, plan):
+        """Get the shared copy of the data if the work is sent to
+        processes (see ``shared_data``), writing it on first use.
+
+        Args:
+            plan : CpuPlan or None
+                The split of the CPU budget (None with ``executor``).
+
+        Returns:
+            SharedArrays or None
+
+        """
+        if self._shared_data is None:
+            processes = isinstance(self._executor, ProcessPoolExecutor) or (
+                self._executor is None and plan.outer > 1
+                and self._backend in ('loky', 'multiprocessing')
+            )
         else:
-            score = self._model.score(X_val, y_val)
-        return score
+            processes = self._shared_data
+        if not processes:
+            return None
+        if self._shared is None:
+            self._shared = SharedArrays(self._X_train, self._y_train,
+                                        self._X_val, self._y_val)
+        return self._shared
+
+    def _fit_subsets(self, subsets, plan, X_train, y_train, X_val, y_val,
+                     shareable=False, warm=None):
+        """Fit and score feature subsets through ``executor``, if given,
+        or else as set out by the CPU plan.
+
+        Args:
+            subsets : list of lists
+                The feature subsets to score.
+            plan : CpuPlan
+                The split of the CPU budget.
+            X_train, y_train, X_val, y_val : ndarray
+                The data to fit and score on.
+            shareable : bool
+                Whether the data are those of this instance, and
+                so may be sent to workers as a shared copy.
+            warm : WarmStart or None
+                If given, the coefficients each fit starts from.
+
+        Returns:
+            scores : list
+                The score of each subset, in the order of `subsets`.
+
+        """
+        data = dict(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val)
+        if self._executor is not None:
+            n_workers = getattr(self._executor, 'n_workers', None) \
+                or self._budget.n_cpus
+            batch_size = self._batch_size or int(np.ceil(
+                len(subsets) / (4 * n_workers)
+            ))
+            return executor_fit_and_score(
+                self._dispatcher(self._executor), self._model, subsets=subsets,
+                criterion=self._scoring, batch_size=batch_size,
+                shared=self._share_with(plan) if shareable else None,
+                warm=warm, **data
+            )
+        if plan.outer == 1:
+            scores = list()
+            with blas_limits(plan.blas_threads):
+                for features in subsets:
+                    model, fit_params = self._primed_model(warm, features)
+                    scores.append(fit_and_score(model, features=features,
+                                                criterion=self._scoring,
+                                                fit_params=fit_params, **data))
+            return scores
+        return parallel_fit_and_score(
+            self._model, subsets=subsets, criterion=self._scoring,
+            n_jobs=plan.outer, backend=self._backend,
+            blas_threads=plan.blas_threads,
+            shared=self._share_with(plan) if shareable else None,
+            warm=warm, **data
+        )
+
+    def _get_speculator(self):
+        """Get the ``Speculator`` of the current ``forward()`` run,
+        starting it (and, without ``executor``, its workers) on first use.
+
+        Returns:
+            Speculator
+
+        """
+        if self._speculator is None:
+            executor, plan = self._executor, None
+            if executor is None:
+                n_workers = self._budget.n_cpus if self._n_jobs == 'auto' \
+                    else self._budget.outer(self._n_jobs)
+                plan = CpuPlan(n_workers, None,
+                               max(1, self._budget.n_cpus // n_workers))
+                if self._backend == 'threading':
+                    executor = self._speculation_pool = ThreadPoolExecutor(n_workers)
+                else:
+                    executor = get_reusable_executor(n_workers)
+            else:
+                n_workers = getattr(executor, 'n_workers', None) \
+                    or self._budget.n_cpus
+            executor = self._dispatcher(executor)
+            blas_threads = None if plan is None else plan.blas_threads
+            data = self._share_with(plan) or (self._X_train, self._y_train,
+                                              self._X_val, self._y_val)
+
+            def submit(features):
+                return executor.submit(_limited_fit_and_score, blas_threads,
+                                       clone(self._model), data, features,
+                                       self._scoring)
+
+            self._speculator = Speculator(submit, n_workers=n_workers,
+                                          depth=self._speculate)
+        return self._speculator
+
+    def _stop_speculation(self):
+        """Cancel outstanding speculative work and record its counters."""
+        if self._speculator is not None:
+            self._speculator.discard()
+            self._stats['speculation_hits'] += self._speculator.hits
+            self._stats['speculation_wasted'] += self._speculator.wasted
+            self._speculator = None
+        if self._speculation_pool is not None:
+            self._speculation_pool.shutdown(wait=False)
+            self._speculation_pool = None
+
+    def _warm_for(self, S):
+        """Get the coefficients of the model on `S` for candidates to
+        start from (see ``warm_start``), fitting it when `S` changes.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+
+        Returns:
+            WarmStart or None
+                None without ``warm_start``, if `S` is empty, or if
+                ``model`` turns out to have no coefficients.
+
+        """
+        if not self._warm_start or not S:
+            return None
+        if self._warm is None or self._warm.features != S:
+            model = clone(self._model)
+            fit_params = dict()
+            if self._warm is not None:  # it too starts warm.
+                fit_params = self._warm.prime(model, S)
+            model.fit(self._X_train[:, S], self._y_train, **fit_params)
+            if not WarmStart.available(model):
+                self._warm_start = False  # e.g., ensembles: fit from scratch.
+                return None
+            self._warm = WarmStart(model, S)
+        return self._warm
+
+    def _primed_model(self, warm, features):
+        """Get the model to fit on `features` in place, and the keyword
+        arguments to fit it with: ``model`` or, if `warm` is given, a clone
+        of it primed from `warm` (see ``WarmStart.prime()``)."""
+        if warm is None:
+            return self._model, dict()
+        if self._warm_model is None:
+            self._warm_model = clone(self._model)
+        return self._warm_model, warm.prime(self._warm_model, features)
+
+    def _checkpoint(self):
+        """Raise ``CancelledError`` if the running ``forward_async()``
+        or ``backward_async()`` call was cancelled."""
+        if self._scope is not None:
+            self._scope.check()
+
+    def _dispatcher(self, executor):
+        """Get `executor` or, in an async call, a version of it whose
+        tasks are cancelled along with the call."""
+        return executor if self._scope is None else self._scope.bind(executor)
+
+    def _compute_scores(self, S, candidates, algorithm):
+        """Score candidate features without consulting the cache.
+
+        If the CPU plan allows, the candidates are fitted concurrently.
+        Either way, the scores are returned in the order of `candidates`
+        so that ties are broken exactly as in a serial run.
+
+        Args:
+            S : list
+                The list of features as found in `forward`
+                and `backward()`
+            candidates : list
+                The features to add (or drop) in turn. None denotes
+                scoring `S` itself.
+            algorithm : str
+                One of: 'forward', 'backward'.
+
+        Returns:
+            scores : list
+                The score of each candidate, in the order of `candidates`.
+
+        """
+        self._checkpoint()
+        engine = self._get_engine(algorithm)
+        if engine is not None:
+            with blas_limits(self._budget.n_cpus):
+                scores = engine.score(S, candidates)
+            if scores is not None:
+                return list(scores)
+            # Otherwise, the engine declined (e.g., `S` is collinear):
+            # fall back to fitting the model.
+
+        if self._speculate is not None and algorithm == 'forward':
+            return self._get_speculator().scores(S, candidates)
+
+        plan = None if self._executor is not None \
+            else self._get_plan(S, candidates, algorithm=algorithm)
+        if plan is not None and plan.outer == 1:
+            with blas_limits(plan.blas_threads):
+                if self._racing is not None and len(candidates) > 1:
+                    return self._race_scores(S, candidates, algorithm=algorithm)
+                return [self._fit_and_score(S, feature=j, algorithm=algorithm)
+                        for j in candidates]
+
+        subsets = [self._candidate_features(S, feature=j, algorithm=algorithm)
+                   for j in candidates]
+        return self._fit_subsets(subsets, plan=plan, X_train=self._X_train,
+                                 y_train=self._y_train, X_val=self._X_val,
+                                 y_val=self._y_val, shareable=True,
+                                 warm=self._warm_for(S))
 
     @staticmethod
     def _do_not_skip(kwargs):
@@ -138,13 +1161,13 @@ class Selection(object):
 
         """
         # a. Check if the algorithm should halt b/c of features themselves
-        if not len(j_score_dict) or len(S) == self._total_number_of_features:
+        if not len(j_score_dict) or len(S) == len(self._features):
             return True
         # b. Break if the change was too small
         if isinstance(min_change, (int, float)) and best_j_score < min_change:
             return True
-        # c. Break if the number of features in S > n_features.
-        elif isinstance(n_features, int) and n_features > len(S):
+        # c. Break once S holds `n_features` features.
+        elif isinstance(n_features, int) and len(S) >= n_features:
             return True
         else:
             return False
@@ -173,12 +1196,47 @@ class Selection(object):
         Raises:
             if ``n_features`` and ``min_change`` are both non-None.
 
+        """
+        return [step.feature for step in self.forward_steps(
+            n_features=n_features, min_change=min_change, **kwargs
+        )]
+
+    def forward_steps(self, n_features=0.5, min_change=None, **kwargs):
+        """Perform Forward Selection, step by step.
+
+        Each feature is yielded as soon as it is added, so the search may be
+        stopped early by abandoning the generator. Closing the generator
+        (e.g., leaving a ``for`` loop over it) cancels outstanding
+        speculative work (see ``speculate``) and removes the shared copy
+        of the data (see ``close()``).
+
+        Args:
+            n_features, min_change, kwargs
+                as in ``forward()``.
+
+        Yields:
+            Step
+                ``(feature, score, elapsed)``: the feature added, the score
+                of the model once it was added and the time (in seconds)
+                since the search began.
+
+        Raises:
+            if ``n_features`` and ``min_change`` are both non-None.
+
         """
         input_checks(locals())
+        return self._released(self._forward_steps(
+            n_features, min_change=min_change,
+            do_not_skip=self._do_not_skip(kwargs)
+        ))
+
+    def _forward_steps(self, n_features, min_change, do_not_skip):
+        start = time.perf_counter()
         S = list()
         best_score = None
-        itera = list(range(self._total_number_of_features))
-        do_not_skip = self._do_not_skip(kwargs)
+        itera = list(self._features)
+        heap = [(-np.inf, position, j, -1, None)
+                for position, j in enumerate(itera)]  # for `lazy`.
 
         if n_features and do_not_skip:
             n_features = parse_n_features(n_features, total=len(itera))
@@ -191,11 +1249,19 @@ class Selection(object):
                 continue
 
             # 1. Find best feature, j, to add.
-            j_score_dict = dict()
-            for j in itera:
-                j_model_score = self._fit_and_score(S, feature=j, algorithm='forward')
-                if best_score is None or (j_model_score > best_score):
-                    j_score_dict[j] = j_model_score
+            if self._lazy:
+                j_score_dict = self._lazy_best_candidate(S, heap=heap,
+                                                         best_score=best_score)
+            else:
+                j_score_dict = dict()
+                candidates = self._halve_candidates(
+                    S, self._shortlist_candidates(S, itera), algorithm='forward'
+                )
+                scores = self._score_candidates(S, candidates=candidates,
+                                                algorithm='forward')
+                for j, j_model_score in zip(candidates, scores):
+                    if best_score is None or (j_model_score > best_score):
+                        j_score_dict[j] = j_model_score
 
             # 2. Save the best j to S, if possible.
             if len(j_score_dict):
@@ -205,6 +1271,7 @@ class Selection(object):
                 best_score = best_j_score  # update the score to beat
                 S.append(best_j)  # add feature
                 itera.remove(best_j)  # no longer search over this feature.
+                yield Step(best_j, best_j_score, time.perf_counter() - start)
 
             if self._forward_break_criteria(S, min_change=min_change,
                                             best_j_score=best_j_score,
@@ -212,8 +1279,6 @@ class Selection(object):
                                             n_features=n_features):
                 break
 
-        return S
-
     def backward(self, n_features=0.5, min_change=None, **kwargs):
         """Perform Backward Selection on a Sklearn model.
 
@@ -241,16 +1306,49 @@ class Selection(object):
         Raises:
             if ``n_features`` and ``min_change`` are both non-None.
 
+        """
+        S = list(self._features)  # start with all features
+        for step in self.backward_steps(n_features=n_features,
+                                        min_change=min_change, **kwargs):
+            S.remove(step.feature)
+        return S
+
+    def backward_steps(self, n_features=0.5, min_change=None, **kwargs):
+        """Perform Backward Selection, step by step.
+
+        As ``forward_steps()``, for the features dropped by ``backward()``.
+
+        Args:
+            n_features, min_change, kwargs
+                as in ``backward()``.
+
+        Yields:
+            Step
+                ``(feature, score, elapsed)``: the feature dropped, the score
+                of the model once it was dropped and the time (in seconds)
+                since the search began.
+
+        Raises:
+            if ``n_features`` and ``min_change`` are both non-None.
+
         """
         input_checks(locals())
-        S = list(range(self._total_number_of_features))  # start with all features
-        do_not_skip = self._do_not_skip(kwargs)
-        last_score_punt = kwargs.get('_last_score_punt', False)
+        return self._released(self._backward_steps(
+            n_features, min_change=min_change,
+            do_not_skip=self._do_not_skip(kwargs),
+            last_score_punt=kwargs.get('_last_score_punt', False)
+        ))
+
+    def _backward_steps(self, n_features, min_change, do_not_skip,
+                        last_score_punt):
+        start = time.perf_counter()
+        S = list(self._features)  # start with all features
 
         if n_features and do_not_skip:
             n_features = parse_n_features(n_features, total=len(S))
 
-        last_iter_score = self._fit_and_score(S, feature=None, algorithm='backward')
+        last_iter_score = self._score_candidates(S, candidates=[None],
+                                                 algorithm='backward')[0]
 
         for i in range(self._total_number_of_features):
             if self._verbose:
@@ -261,8 +1359,10 @@ class Selection(object):
 
             # 1. Hunt for the least predictive feature.
             best = {'feature': None, 'score': None, 'defeated_last_iter_score': True}
-            for j in S:
-                score = self._fit_and_score(S, feature=j, algorithm='backward')
+            candidates = self._halve_candidates(S, S, algorithm='backward')
+            scores = self._score_candidates(S, candidates=candidates,
+                                            algorithm='backward')
+            for j, score in zip(candidates, scores):
                 if best['score'] is None or score > best['score']:
                     best = {'feature': j, 'score': score,
                             'defeated_last_iter_score': score > last_iter_score}
@@ -272,6 +1372,7 @@ class Selection(object):
             if isinstance(n_features, int):
                 S.remove(to_drop)  # blindly drop.
                 last_iter_score = best_new_score
+                yield Step(to_drop, best_new_score, time.perf_counter() - start)
                 if not len(S) == n_features:
                     continue  # i.e., ignore criteria below.
                 else:
@@ -284,7 +1385,284 @@ class Selection(object):
                     else:
                         S.remove(to_drop)
                         last_iter_score = best_new_score
+                        yield Step(to_drop, best_new_score,
+                                   time.perf_counter() - start)
                 else:
                     break
 
-        return S
\ No newline at end of file
+    def forward_path(self):
+        """Trace the complete path of forward selection: features are
+        added until none improves the score, or none remains.
+
+        Returns:
+            SelectionPath
+                From which the features selected with any ``n_features``
+                or ``min_change`` may be read (see ``SelectionPath.select()``).
+
+        """
+        return self._trace_path('forward', self._forward_steps(
+            None, min_change=None, do_not_skip=True
+        ))
+
+    def backward_path(self):
+        """Trace the complete path of backward selection: features are
+        dropped until only one remains.
+
+        Returns:
+            SelectionPath
+                See ``forward_path()``.
+
+        """
+        return self._trace_path('backward', self._backward_steps(
+            1, min_change=None, do_not_skip=True, last_score_punt=False
+        ))
+
+    def _trace_path(self, algorithm, steps):
+        """Run the generator `steps` to exhaustion, recording the
+        score of every candidate of each step.
+
+        Args:
+            algorithm : str
+                One of: 'forward', 'backward'.
+            steps : generator
+                Yields ``Step``s.
+
+        Returns:
+            SelectionPath
+
+        """
+        features, scores, candidate_scores = list(), list(), list()
+        initial_score = np.nan
+        self._trace = trace = list()
+        try:
+            for step in self._released(steps):
+                row = np.full(self._total_number_of_features, np.nan)
+                for candidates, values in trace:
+                    if candidates == [None]:
+                        initial_score = values[0]
+                    else:
+                        row[candidates] = values
+                del trace[:]
+                features.append(step.feature)
+                scores.append(step.score)
+                candidate_scores.append(row)
+        finally:
+            self._trace = None
+        return SelectionPath(
+            algorithm, columns=self._features, features=features,
+            scores=scores, initial_score=initial_score,
+            candidate_scores=np.reshape(candidate_scores,
+                                        (-1, self._total_number_of_features))
+        )
+
+    def _released(self, steps):
+        """Run the generator `steps`, releasing worker resources when it
+        ends, fails or is abandoned.
+
+        Args:
+            steps : generator
+                Yields ``Step``s.
+
+        Yields:
+            Step
+
+        """
+        try:
+            yield from steps
+        except GeneratorExit:
+            self.close()
+            raise
+        finally:
+            self._stop_speculation()
+            self._buffer = None
+
+    def forward_all(self, criteria=(None, 'aic', 'bic'), n_features=0.5,
+                    min_change=None):
+        """Perform Forward Selection under several criteria, fitting
+        each candidate model only once.
+
+        Each candidate is fitted and predicts once, and its scores under
+        all of `criteria` are computed from that prediction and remembered
+        (in the score cache, or a temporary one if ``cache_size`` and
+        ``cache_file`` are None). Selection is then run for each criterion
+        in turn, and reuses the scores of every candidate already fitted.
+        Results are identical to those of separate runs with each
+        ``criterion``. Scores under criteria other than ``criterion``
+        are not persisted to ``cache_file``.
+
+        Args:
+            criteria (iterable)
+                distinct members of: None, 'aic', 'bic'.
+                Defaults to all three.
+            n_features, min_change
+                as in ``forward()``.
+
+        Returns:
+            dict
+                Maps each criterion to the features selected under it.
+
+        """
+        return self._select_all(self.forward, criteria, n_features=n_features,
+                                min_change=min_change)
+
+    def backward_all(self, criteria=(None, 'aic', 'bic'), n_features=0.5,
+                     min_change=None):
+        """Perform Backward Selection under several criteria, fitting
+        each candidate model only once.
+
+        See ``forward_all()``.
+
+        Args:
+            criteria (iterable)
+                distinct members of: None, 'aic', 'bic'.
+                Defaults to all three.
+            n_features, min_change
+                as in ``backward()``.
+
+        Returns:
+            dict
+                Maps each criterion to the features selected under it.
+
+        """
+        return self._select_all(self.backward, criteria, n_features=n_features,
+                                min_change=min_change)
+
+    def _select_all(self, method, criteria, **kwargs):
+        """Run `method` under each of `criteria`, scoring every
+        candidate under all of them (see ``forward_all()``).
+
+        Args:
+            method : callable
+                ``forward()`` or ``backward()``.
+            criteria : iterable
+                The criteria to select under.
+            kwargs : dict
+                Passed to `method`.
+
+        Returns:
+            dict
+
+        """
+        criteria = tuple(criteria)
+        if not criteria or len(set(criteria)) != len(criteria) or \
+                any(c not in (None, 'aic', 'bic') for c in criteria):
+            raise ValueError("`criteria` must be distinct members "
+                             "of: None, 'aic', 'bic'.")
+        original = self._criterion, self._cache, self._disk_cache
+        if self._cache is None:
+            self._cache = ScoreCache(None)
+        self._disk_cache = None  # its records are for `criterion` alone.
+        selected = dict()
+        try:
+            for criterion in criteria:
+                self._use_criterion(criterion, scoring=(criterion,) + tuple(
+                    c for c in criteria if c != criterion
+                ))
+                selected[criterion] = method(**kwargs)
+        finally:
+            self._use_criterion(original[0], scoring=original[0])
+            self._cache, self._disk_cache = original[1:]
+        return selected
+
+    def _use_criterion(self, criterion, scoring):
+        """Select under `criterion`, scoring candidates under `scoring`."""
+        self._criterion, self._scoring = criterion, scoring
+        for engine in self._engines.values():
+            engine.criterion = criterion
+
+    def _run_async(self, method, **kwargs):
+        """Run `method` in a thread of its own, as a coroutine.
+
+        Args:
+            method : callable
+                ``forward()`` or ``backward()``.
+            kwargs : dict
+                Passed to `method`.
+
+        Returns:
+            coroutine
+
+        """
+        if self._scope is not None:
+            raise RuntimeError("A selection is already running on this instance.")
+        self._scope = CancelScope()
+        # The run fits the model in place, in a thread of its own: give it
+        # a copy, as other (async) runs may share the model passed in.
+        self._model = clone(self._model)
+        self._warm_model = None
+        done = Future()
+        done.set_running_or_notify_cancel()  # i.e., cancelled by the scope only.
+
+        def run():
+            try:
+                result = method(**kwargs)
+            except BaseException as e:
+                done.set_exception(e)
+            else:
+                done.set_result(result)
+
+        async def wait():
+            try:
+                return await asyncio.wrap_future(done)
+            except asyncio.CancelledError:
+                self._scope.cancel()
+                # Let the fits in progress finish, so that nothing
+                # runs on behalf of the call once it has returned.
+                try:
+                    await asyncio.wrap_future(done)
+                except (Exception, asyncio.CancelledError):
+                    pass
+                raise
+            finally:
+                self._scope = None
+
+        threading.Thread(target=run, daemon=True).start()
+        return wait()
+
+    async def forward_async(self, n_features=0.5, min_change=None):
+        """Perform Forward Selection without blocking the event loop.
+
+        Runs ``forward()`` in a thread of its own, so results are identical.
+        Candidates are fitted in that thread or, if ``executor`` is given,
+        through it: pass several instances the same (bounded) executor to
+        share one pool of workers between concurrent selections. Fits are
+        made on a clone of ``model``, so instances may share it.
+
+        Cancelling the call stops selection at the next candidate: queued
+        tasks are cancelled, and fits in progress are waited for. With
+        ``n_jobs`` other than 1 (and no ``executor``), selection stops at
+        the next iteration instead. Only one call may run at a time on
+        an instance.
+
+        Args:
+            n_features (int or float)
+                as in ``forward()``.
+            min_change (int or float)
+                as in ``forward()``.
+
+        Returns:
+            S (list)
+              The column indices of ``X_train`` (and ``X_val``) that denote the chosen features.
+
+        """
+        return await self._run_async(self.forward, n_features=n_features,
+                                     min_change=min_change)
+
+    async def backward_async(self, n_features=0.5, min_change=None):
+        """Perform Backward Selection without blocking the event loop.
+
+        See ``forward_async()``.
+
+        Args:
+            n_features (int or float)
+                as in ``backward()``.
+            min_change (int or float)
+                as in ``backward()``.
+
+        Returns:
+            S (list)
+              The column indices of `X_train` (and `X_val`) that denote the chosen features.
+
+        """
+        return await self._run_async(self.backward, n_features=n_features,
+                                     min_change=min_change)
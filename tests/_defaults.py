@@ -10,5 +10,11 @@ from pypunisher.example_data._example_data import X_train, y_train, X_val, y_val
 
 DEFAULT_SELECTION_PARAMS = {
     'model': LinearRegression(), 'X_train': X_train, 'y_train': y_train,
-    'X_val': X_val, 'y_val': y_val, 'verbose': False, 'criterion': None
+    'X_val': X_val, 'y_val': y_val, 'verbose': False, 'criterion': None,
+    'n_jobs': 1, 'backend': 'loky', 'engine': 'auto',
+    'cache_size': None, 'cache_file': None, 'shortlist': None,
+    'prefilter': None, 'preflight': False, 'lazy': False,
+    'halving': None, 'halving_factor': 3, 'racing': None,
+    'n_cpus': None, 'executor': None, 'batch_size': None,
+    'shared_data': None, 'speculate': None, 'warm_start': False
 }
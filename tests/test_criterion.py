@@ -7,13 +7,14 @@ Criterion Tests
 import os
 import sys
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.abspath("."))
 sys.path.insert(0, os.path.abspath("../"))
 
 import statsmodels.api as sm
-from pypunisher.metrics.criterion import aic, bic
+from pypunisher.metrics.criterion import aic, bic, aic_batch, bic_batch
 from sklearn.linear_model import LinearRegression
 from pypunisher.example_data._example_data import X_train, y_train
 from tests._wrappers import forward, backward
@@ -110,3 +111,41 @@ def test_metric_output_value():
         assert test, "`{}()` does not match the value from StatsModels.".format(
             metric.__name__
         )
+
+
+# -----------------------------------------------------------------------------
+# Batch metrics
+# -----------------------------------------------------------------------------
+
+def test_batch_metrics_match_single_model():
+    """Test that `aic_batch()` and `bic_batch()` match `aic()`
+    and `bic()` applied to each model in turn, whether given
+    predictions or residual sums of squares."""
+    subsets = ([7], [7, 13], [7, 13, 18], list(range(20)))
+    models = [LinearRegression().fit(X_train[:, s], y_train) for s in subsets]
+    y_pred = np.column_stack([m.predict(X_train[:, s])
+                              for m, s in zip(models, subsets)])
+    rss = ((y_train[:, np.newaxis] - y_pred) ** 2).sum(axis=0)
+    k = np.array([len(s) for s in subsets])
+
+    for metric, batch in ((aic, aic_batch), (bic, bic_batch)):
+        expected = [metric(m, X_train=X_train[:, s], y_train=y_train)
+                    for m, s in zip(models, subsets)]
+        assert np.allclose(batch(k, y_true=y_train, y_pred=y_pred), expected)
+        assert np.allclose(batch(k, rss=rss, n=len(y_train)), expected)
+
+
+def test_batch_metrics_params():
+    """Test that the batch metrics raise when given neither
+    or both of predictions and residual sums of squares,
+    or inputs of the wrong type."""
+    y_pred = np.column_stack([y_train, y_train])
+    for batch in (aic_batch, bic_batch):
+        with pytest.raises(TypeError, match="Exactly one of"):
+            batch(1)
+        with pytest.raises(TypeError, match="Exactly one of"):
+            batch(1, y_true=y_train, y_pred=y_pred, rss=np.ones(2), n=5)
+        with pytest.raises(TypeError):
+            batch(1, y_true=y_train, y_pred=y_train)
+        with pytest.raises(TypeError):
+            batch(1, rss=np.ones(2))
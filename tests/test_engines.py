@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+
+"""
+Tests Specific to the Selection Engines
+=======================================
+"""
+import os
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.abspath("../"))
+
+from tests._wrappers import _sel, forward, backward
+from pypunisher.example_data._example_data import X_train, y_train, X_val, y_val
+from pypunisher.selection_engines._buffer import ColumnBuffer
+from pypunisher import Selection
+from pypunisher.selection_engines import _linear, _scheduler
+from pypunisher.selection_engines._linear import supports_linear_engine
+from pypunisher.selection_engines._scheduler import CpuBudget, CpuPlan
+
+# -----------------------------------------------------------------------------
+# Setup
+# -----------------------------------------------------------------------------
+
+rng = np.random.RandomState(99)
+COEFS = np.array([3., -2., 1.5, 1.])
+X_TRAIN_RAND = rng.normal(size=(120, 12))
+X_VAL_RAND = rng.normal(size=(80, 12))
+# Make one column an exact linear combination of two others.
+X_TRAIN_RAND[:, 6] = X_TRAIN_RAND[:, 1] + X_TRAIN_RAND[:, 2]
+X_VAL_RAND[:, 6] = X_VAL_RAND[:, 1] + X_VAL_RAND[:, 2]
+Y_TRAIN_RAND = X_TRAIN_RAND[:, :4] @ COEFS + rng.normal(size=120)
+Y_VAL_RAND = X_VAL_RAND[:, :4] @ COEFS + rng.normal(size=80)
+
+
+def _rand_sel(**kwargs):
+    return _sel(X_train=X_TRAIN_RAND, y_train=Y_TRAIN_RAND,
+                X_val=X_VAL_RAND, y_val=Y_VAL_RAND, **kwargs)[0]
+
+
+# -----------------------------------------------------------------------------
+# Test Engine Choice
+# -----------------------------------------------------------------------------
+
+def test_invalid_engine():
+    """
+    Check that unknown engines raise.
+    """
+    msg = "`engine` must be one of: 'auto', 'generic'."
+    with pytest.raises(ValueError, match=msg):
+        forward(engine='qr')
+
+
+def test_supports_linear_engine():
+    """
+    Check that only plain `LinearRegression` models
+    are recognised by the linear engines.
+    """
+    assert supports_linear_engine(LinearRegression(), Y_TRAIN_RAND)
+    assert not supports_linear_engine(LinearRegression(positive=True),
+                                      Y_TRAIN_RAND)
+    assert not supports_linear_engine(Ridge(), Y_TRAIN_RAND)
+
+
+# -----------------------------------------------------------------------------
+# Test Forward QR Engine
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+@pytest.mark.parametrize("fit_intercept", [True, False])
+def test_forward_engine_scores_match_generic(criterion, fit_intercept):
+    """
+    Check that the forward engine scores every candidate
+    exactly as fitting `LinearRegression` would.
+    """
+    kwargs = dict(criterion=criterion,
+                  model=LinearRegression(fit_intercept=fit_intercept))
+    linear, generic = _rand_sel(**kwargs), _rand_sel(engine='generic', **kwargs)
+    for S in ([], [2], [2, 0], [2, 0, 5], [1]):
+        candidates = [j for j in range(12) if j not in S]
+        ours = linear._score_candidates(S, candidates, algorithm='forward')
+        theirs = generic._score_candidates(S, candidates, algorithm='forward')
+        assert np.allclose(ours, theirs, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+def test_forward_engine_selection_matches_generic(criterion):
+    """
+    Check that forward selection picks the same features
+    with and without the linear engine.
+    """
+    for kwargs in ({'n_features': 0.5}, {'n_features': None, 'min_change': 0.1}):
+        assert forward(criterion=criterion, **kwargs) == \
+            forward(criterion=criterion, engine='generic', **kwargs)
+    # Note: exhausting the loop on the random data would compare how
+    # the collinear column's exact tie is broken by rounding error.
+    assert _rand_sel(criterion=criterion).forward(n_features=0.5) == \
+        _rand_sel(criterion=criterion, engine='generic').forward(n_features=0.5)
+
+
+# -----------------------------------------------------------------------------
+# Test Backward Sweep Engine
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+@pytest.mark.parametrize("fit_intercept", [True, False])
+def test_backward_engine_scores_match_generic(criterion, fit_intercept):
+    """
+    Check that the backward engine scores every candidate
+    (and the current model, `None`) exactly as fitting
+    `LinearRegression` would.
+    """
+    kwargs = dict(criterion=criterion,
+                  model=LinearRegression(fit_intercept=fit_intercept))
+    linear, generic = _rand_sel(**kwargs), _rand_sel(engine='generic', **kwargs)
+    S = [0, 1, 2, 3, 4, 5, 7, 8, 9]
+    while len(S) > 1:
+        candidates = [None] + S
+        ours = linear._score_candidates(S, candidates, algorithm='backward')
+        theirs = generic._score_candidates(S, candidates, algorithm='backward')
+        assert np.allclose(ours, theirs, rtol=1e-9, atol=1e-9)
+        S = S[:-2] + S[-1:]  # drop a column, forcing a downdate
+
+
+def test_backward_engine_reads_validation_data_once():
+    """
+    Check that downdates and scoring work from the validation
+    cross products alone, without reading `X_val` again.
+    """
+    linear, generic = _rand_sel(), _rand_sel(engine='generic')
+    S = [0, 1, 2, 3, 4, 5, 7, 8, 9]
+    linear._score_candidates(S, S, algorithm='backward')
+    engine = linear._engines['backward']
+    engine._X_val = None
+    while len(S) > 2:
+        S = S[1:]
+        assert np.allclose(engine.score(S, S),
+                           generic._score_candidates(S, S, algorithm='backward'),
+                           rtol=1e-9, atol=1e-9)
+
+
+def test_backward_engine_falls_back_on_collinear_columns():
+    """
+    Check that collinear feature sets (column 6 is the sum
+    of columns 1 and 2) are scored by fitting the model.
+    """
+    linear, generic = _rand_sel(), _rand_sel(engine='generic')
+    S = list(range(12))
+    assert np.allclose(linear._score_candidates(S, S, algorithm='backward'),
+                       generic._score_candidates(S, S, algorithm='backward'))
+    assert linear._engines['backward'].score(S, S) is None
+
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+def test_backward_engine_selection_matches_generic(criterion):
+    """
+    Check that backward selection picks the same features
+    with and without the linear engine.
+    """
+    for kwargs in ({'n_features': 2}, {'n_features': None, 'min_change': 1e-4}):
+        assert backward(criterion=criterion, **kwargs) == \
+            backward(criterion=criterion, engine='generic', **kwargs)
+        assert _rand_sel(criterion=criterion).backward(**kwargs) == \
+            _rand_sel(criterion=criterion, engine='generic').backward(**kwargs)
+
+
+@pytest.mark.parametrize("algorithm", ['forward', 'backward'])
+def test_engines_in_row_chunks(algorithm, monkeypatch):
+    """
+    Check that processing the data in blocks of rows
+    does not change the scores.
+    """
+    S = [2, 0, 5] if algorithm == 'forward' else [0, 1, 2, 3, 4, 5, 7]
+    candidates = [j for j in range(12) if j not in S] \
+        if algorithm == 'forward' else [None] + S
+    expected = _rand_sel()._score_candidates(S, candidates, algorithm)
+    monkeypatch.setattr(_linear, '_CHUNK_ROWS', 7)
+    chunked = _rand_sel()._score_candidates(S, candidates, algorithm)
+    assert np.allclose(chunked, expected, rtol=1e-9, atol=1e-9)
+
+
+# -----------------------------------------------------------------------------
+# Test Streaming (Sufficient Statistics) Engines
+# -----------------------------------------------------------------------------
+
+def _blocks(X, y, size=17):
+    return ((X[i:i + size], y[i:i + size]) for i in range(0, len(y), size))
+
+
+def _stream_sel(criterion=None, fit_intercept=True):
+    return Selection.from_blocks(
+        _blocks(X_TRAIN_RAND, Y_TRAIN_RAND), _blocks(X_VAL_RAND, Y_VAL_RAND),
+        criterion=criterion, fit_intercept=fit_intercept, verbose=False
+    )
+
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+@pytest.mark.parametrize("fit_intercept", [True, False])
+def test_streaming_scores_match_generic(criterion, fit_intercept):
+    """
+    Check that scores computed from streamed sufficient statistics
+    match those of fitting `LinearRegression` on the full data,
+    including on collinear feature sets.
+    """
+    stream = _stream_sel(criterion, fit_intercept=fit_intercept)
+    generic = _rand_sel(engine='generic', criterion=criterion,
+                        model=LinearRegression(fit_intercept=fit_intercept))
+    for S in ([], [2], [2, 0, 5]):
+        candidates = [j for j in range(12) if j not in S]
+        assert np.allclose(
+            stream._score_candidates(S, candidates, algorithm='forward'),
+            generic._score_candidates(S, candidates, algorithm='forward'),
+            rtol=1e-8, atol=1e-8
+        )
+    for S in ([0, 1, 2, 3, 4, 5, 7], list(range(12))):
+        candidates = [None] + S
+        assert np.allclose(
+            stream._score_candidates(S, candidates, algorithm='backward'),
+            generic._score_candidates(S, candidates, algorithm='backward'),
+            rtol=1e-8, atol=1e-8
+        )
+
+
+def test_streaming_selection_matches_arrays():
+    """
+    Check that streamed selection picks the same
+    features as selection on in-memory arrays.
+    """
+    for criterion in (None, 'aic', 'bic'):
+        # Note: on the random data, adding column 2 or 6 to [0, 1] (or
+        # dropping column 1, 2 or 6) ties exactly, so paths stop short of it.
+        assert _stream_sel(criterion).forward(n_features=2) == \
+            _rand_sel(criterion=criterion).forward(n_features=2)
+        stream = Selection.from_blocks(
+            _blocks(X_train, y_train), _blocks(X_val, y_val),
+            criterion=criterion, verbose=False
+        )
+        for kwargs in ({'n_features': 2}, {'n_features': None, 'min_change': 1e-4}):
+            assert stream.backward(**kwargs) == \
+                backward(criterion=criterion, **kwargs)
+
+
+def test_streaming_full_path_matches_arrays():
+    """
+    Check that streamed selection follows the whole path of selection on
+    in-memory arrays, without adding an inert (here, constant) column once
+    the score stops improving.
+    """
+    rng = np.random.RandomState(0)
+    X_train, X_val = rng.normal(size=(120, 8)), rng.normal(size=(80, 8))
+    X_train[:, 5] = X_val[:, 5] = 1.
+    coefs = np.array([3, -2, 1.5, .5, 0, 0, 0, 0])
+    y_train = X_train @ coefs + rng.normal(size=120)
+    y_val = X_val @ coefs + rng.normal(size=80)
+    for criterion in (None, 'aic', 'bic'):
+        stream = Selection.from_blocks(
+            _blocks(X_train, y_train), _blocks(X_val, y_val),
+            criterion=criterion, verbose=False
+        )
+        arrays = _sel(X_train=X_train, y_train=y_train, X_val=X_val,
+                      y_val=y_val, criterion=criterion)[0]
+        for method in ('forward', 'backward'):
+            S = getattr(stream, method)(n_features=None, min_change=1e-12)
+            assert S == getattr(arrays, method)(n_features=None,
+                                                min_change=1e-12)
+        if criterion is None:
+            assert 5 not in stream.forward(n_features=None, min_change=1e-12)
+
+
+def test_streaming_invalid_blocks():
+    """
+    Check that empty or inconsistent blocks raise.
+    """
+    with pytest.raises(ValueError, match="must yield at least one row"):
+        Selection.from_blocks(iter([]), _blocks(X_VAL_RAND, Y_VAL_RAND))
+    with pytest.raises(ValueError, match="Blocks must be"):
+        Selection.from_blocks([(X_TRAIN_RAND, Y_TRAIN_RAND[:-1])],
+                              _blocks(X_VAL_RAND, Y_VAL_RAND))
+    with pytest.raises(ValueError, match="same number of features"):
+        Selection.from_blocks(_blocks(X_TRAIN_RAND, Y_TRAIN_RAND),
+                              _blocks(X_VAL_RAND[:, :5], Y_VAL_RAND))
+
+
+# -----------------------------------------------------------------------------
+# Test Column Buffer
+# -----------------------------------------------------------------------------
+
+def test_column_buffer_views():
+    """
+    Check that buffer views hold exactly the requested columns, in the
+    requested order, are contiguous views and leave the source matrices
+    untouched, and that successive backward candidates cost one swap.
+    """
+    original = X_TRAIN_RAND.copy()
+    buffer = ColumnBuffer(X_TRAIN_RAND, X_VAL_RAND)
+    for features in ([3], [3, 7], [3, 7, 0], [3, 0], [11, 3, 0, 5], [5],
+                     [5, 11, 3], [0, 3, 5, 11]):
+        X_train, X_val = buffer.views(features)
+        assert X_train.flags['F_CONTIGUOUS']
+        assert np.shares_memory(X_train, buffer.views(features)[0])
+        assert np.array_equal(X_train, X_TRAIN_RAND[:, features])
+        assert np.array_equal(X_val, X_VAL_RAND[:, features])
+    assert np.array_equal(X_TRAIN_RAND, original)
+
+    S = [9, 2, 7, 4, 0, 11]
+    buffer.views([f for f in S if f != S[0]])
+    swaps = list()
+    swap = buffer._swap
+    buffer._swap = lambda i, j: (swaps.append((i, j)), swap(i, j))
+    for j in S[1:]:
+        features = [f for f in S if f != j]
+        assert np.array_equal(buffer.views(features)[0],
+                              X_TRAIN_RAND[:, features])
+    assert len(swaps) == len(S) - 1
+
+
+def test_buffer_preserves_column_order():
+    """
+    Check that estimators which depend on column order select the same
+    features on every run, as with copies from fancy indexing.
+    """
+    model = RandomForestRegressor(n_estimators=5, max_features=0.5,
+                                  random_state=0)
+    sel = _rand_sel(model=model, engine='generic')
+    expected = sel.backward(n_features=4)
+    for _ in range(3):
+        assert sel.backward(n_features=4) == expected
+    with ThreadPoolExecutor(1) as executor:  # i.e., fancy indexing.
+        assert _rand_sel(model=model, engine='generic', executor=executor) \
+            .backward(n_features=4) == expected
+
+
+def test_buffer_is_released_after_each_run():
+    """
+    Check that the working copy of the columns is not kept between runs.
+    """
+    sel = _rand_sel(engine='generic')
+    steps = sel.backward_steps(n_features=4)
+    next(steps)
+    assert sel._buffer is not None
+    steps.close()
+    assert sel._buffer is None
+    sel.backward(n_features=4)
+    assert sel._buffer is None
+    sel.forward_path()
+    assert sel._buffer is None
+
+
+# -----------------------------------------------------------------------------
+# CPU budget
+# -----------------------------------------------------------------------------
+
+
+def test_cpu_budget_split_follows_fit_times(monkeypatch):
+    """
+    Check that cores go to the estimator's `n_jobs` when its fits
+    scale with them, and to concurrent candidates when they do not.
+    """
+    def timed(scaling):
+        # Fit times as a function of `n_jobs` and of native threads.
+        return lambda fit, n_jobs, blas_threads: \
+            0.02 / (n_jobs if scaling == 'n_jobs' else 1) \
+            / (blas_threads if scaling == 'blas' else 1)
+
+    budget = CpuBudget(n_cpus=4)
+    monkeypatch.setattr(_scheduler, '_timed', timed('n_jobs'))
+    assert budget.plan(None, n_candidates=8, n_jobs_declared=True) == \
+        CpuPlan(outer=1, n_jobs=4, blas_threads=1)
+    monkeypatch.setattr(_scheduler, '_timed', timed('blas'))
+    assert budget.plan(None, n_candidates=8, n_jobs_declared=True) == \
+        CpuPlan(outer=1, n_jobs=1, blas_threads=4)
+    monkeypatch.setattr(_scheduler, '_timed', timed(None))
+    assert budget.plan(None, n_candidates=8, n_jobs_declared=True) == \
+        CpuPlan(outer=4, n_jobs=1, blas_threads=1)
+    assert budget.plan(None, n_candidates=8, n_jobs_declared=False,
+                       outer=2) == CpuPlan(outer=2, n_jobs=None, blas_threads=2)
+
+
+def test_cpu_budget_of_one_core_does_not_time_fits():
+    """
+    Check that a single core, or a single concurrent candidate (given
+    the whole budget), is planned without fitting anything.
+    """
+    def fit(n_jobs):
+        raise AssertionError("fitted")
+    assert CpuBudget(n_cpus=1).plan(fit, n_candidates=8, n_jobs_declared=True) \
+        == CpuPlan(outer=1, n_jobs=1, blas_threads=1)
+    assert CpuBudget(n_cpus=4).plan(fit, n_candidates=8, n_jobs_declared=True,
+                                    outer=1) == CpuPlan(1, 4, 4)
+    assert CpuBudget(n_cpus=6).outer(-1) == 6
+    assert CpuBudget(n_cpus=6).outer(-2) == 5
+
+
+def test_cpu_budget_skips_ignored_n_jobs():
+    """
+    Check that an estimator which warns that it ignores `n_jobs` is
+    not timed (nor planned) with it.
+    """
+    calls = list()
+
+    def fit(n_jobs):
+        calls.append(n_jobs)
+        warnings.warn("'n_jobs' has no effect.", FutureWarning)
+
+    plan = CpuBudget(n_cpus=4).plan(fit, n_candidates=8, n_jobs_declared=True)
+    assert calls == [1, 1, 1] and plan.n_jobs is None
+
+
+def test_n_jobs_is_never_set_on_the_model():
+    """
+    Check that `n_jobs` is only set on estimators which declare it, and
+    then only on a clone: the model passed in is left as is.
+    """
+    model = Lasso(alpha=1.)
+    Selection(model, X_train, y_train, X_val, y_val, verbose=False,
+              n_cpus=2, n_jobs='auto').forward(n_features=3)
+    assert 'n_jobs' not in vars(model)
+
+    model = LinearRegression(n_jobs=-1)
+    sel = Selection(model, X_train, y_train, X_val, y_val, verbose=False,
+                    engine='generic', n_cpus=2, n_jobs=2, backend='threading')
+    sel.forward(n_features=3)
+    assert sel._plan == CpuPlan(outer=2, n_jobs=1, blas_threads=1)
+    assert model.n_jobs == -1 and sel._model.n_jobs == 1
+
+    model = LinearRegression()
+    sel = Selection(model, X_train, y_train, X_val, y_val, verbose=False,
+                    engine='generic', n_cpus=2)
+    sel.forward(n_features=3)
+    assert sel._plan == CpuPlan(outer=1, n_jobs=2, blas_threads=2)
+    assert model.n_jobs is None and sel._model.n_jobs == 2
+
+
+def test_invalid_cpu_budget():
+    """
+    Check the validation of `n_cpus` and `n_jobs`.
+    """
+    with pytest.raises(ValueError, match="`n_cpus` must be"):
+        forward(n_cpus=0)
+    with pytest.raises(ValueError, match="`n_jobs` must be"):
+        forward(n_jobs='all')
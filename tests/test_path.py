@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+"""
+Tests Specific to Selection Paths
+=================================
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.abspath("../"))
+
+from pypunisher import Selection, SelectionPath
+from tests._defaults import DEFAULT_SELECTION_PARAMS
+
+# -----------------------------------------------------------------------------
+# Setup
+# -----------------------------------------------------------------------------
+
+
+def _params(**kwargs):
+    rng = np.random.RandomState(3)
+    X_train, X_val = rng.normal(size=(300, 10)), rng.normal(size=(200, 10))
+    beta = np.array([0, 3, 0, 0, 1, 0, 2, 0, .5, 0])
+    return dict(DEFAULT_SELECTION_PARAMS, X_train=X_train, X_val=X_val,
+                y_train=X_train @ beta + rng.normal(size=300),
+                y_val=X_val @ beta + rng.normal(size=200), **kwargs)
+
+# -----------------------------------------------------------------------------
+# Tests
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("engine", ['auto', 'generic'])
+def test_path_matches_repeated_selection(engine):
+    """
+    Check that the selections read off a path are exactly those of
+    ``forward()`` and ``backward()`` run with each setting.
+    """
+    sel = Selection(**_params(engine=engine))
+    path = sel.forward_path()
+    for n_features in (1, 2, 4, 0.5):
+        assert path.select(n_features=n_features) == \
+            sel.forward(n_features=n_features)
+    for min_change in (0.5, 0.7, 0.9, 0.937, 0.95):
+        assert path.select(min_change=min_change) == \
+            sel.forward(n_features=None, min_change=min_change)
+
+    path = sel.backward_path()
+    assert len(path) == 9
+    for n_features in (1, 4, 7, 0.5):
+        assert path.select(n_features=n_features) == \
+            sel.backward(n_features=n_features)
+    for min_change in (1e-5, 1e-3, 0.5):
+        assert path.select(min_change=min_change) == \
+            sel.backward(n_features=None, min_change=min_change)
+
+
+def test_path_records_candidate_scores():
+    """
+    Check that each step records the score of every candidate,
+    with the best candidate's being the step's score.
+    """
+    path = Selection(**_params()).backward_path()
+    assert path.candidate_scores.shape == (9, 10)
+    for i, row in enumerate(path.candidate_scores):
+        assert np.sum(~np.isnan(row)) == 10 - i
+        assert np.nanmax(row) == row[path.features[i]] == path.scores[i]
+    assert not np.isnan(path.initial_score)
+
+
+def test_path_round_trip(tmp_path):
+    """
+    Check that a path saved to a file is loaded unchanged.
+    """
+    path = Selection(**_params(engine='generic')).forward_path()
+    file = str(tmp_path / "path.npz")
+    path.save(file)
+    loaded = SelectionPath.load(file)
+    assert loaded.algorithm == 'forward'
+    for name in ('columns', 'features', 'scores', 'candidate_scores'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(path, name))
+    assert np.isnan(loaded.initial_score)
+    assert loaded.select(min_change=0.8) == path.select(min_change=0.8)
+
+
+def test_invalid_selection_from_path():
+    """
+    Check the inputs of ``SelectionPath.select()``.
+    """
+    path = Selection(**_params()).forward_path()
+    with pytest.raises(TypeError):
+        path.select(n_features=2, min_change=0.1)
+    with pytest.raises(ValueError):
+        path.select(n_features=len(path) + 1)
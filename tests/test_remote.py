@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""
+Tests Specific to Remote Workers
+================================
+"""
+import collections
+import gc
+import multiprocessing
+import os
+import pickle
+import sys
+
+import pytest
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.abspath("../"))
+
+from pypunisher import Selection
+from pypunisher.selection_engines import remote
+from pypunisher.selection_engines.remote import RemotePool, Worker
+from tests._defaults import DEFAULT_SELECTION_PARAMS
+
+# -----------------------------------------------------------------------------
+# Setup
+# -----------------------------------------------------------------------------
+
+
+class _DyingRegression(LinearRegression):
+    """Kills the worker process with the given `pid` when fitted there."""
+
+    def __init__(self, pid=None):
+        super(_DyingRegression, self).__init__()
+        self.pid = pid
+
+    def fit(self, X, y):
+        if os.getpid() == self.pid:
+            os._exit(1)
+        return super(_DyingRegression, self).fit(X, y)
+
+
+@pytest.fixture
+def workers():
+    """Start three workers on localhost."""
+    processes, addresses = list(), list()
+    for _ in range(3):
+        worker = Worker()
+        process = multiprocessing.get_context('fork').Process(
+            target=worker.serve_forever, daemon=True
+        )
+        process.start()
+        worker._server.close()  # the worker process holds its own copy.
+        processes.append(process)
+        addresses.append(worker.address)
+    yield processes, addresses
+    for process in processes:
+        process.terminate()
+
+
+def _params(**kwargs):
+    return dict(DEFAULT_SELECTION_PARAMS, engine='generic', **kwargs)
+
+
+def _select(**kwargs):
+    sel = Selection(**_params(**kwargs))
+    return sel.forward(n_features=None, min_change=1e-4), sel.backward(n_features=3)
+
+# -----------------------------------------------------------------------------
+# Tests
+# -----------------------------------------------------------------------------
+
+
+def test_remote_matches_serial_and_ships_data_once(workers, monkeypatch):
+    """
+    Check that farming candidates out to workers selects exactly the
+    features of a serial run, while each array is sent to each worker
+    at most once.
+    """
+    _, addresses = workers
+    shipped = list()
+    send = remote._send
+
+    def counting_send(sock, obj):
+        if obj[0] == 'data':
+            shipped.append((sock.getpeername(), obj[1]))
+        send(sock, obj)
+
+    monkeypatch.setattr(remote, '_send', counting_send)
+    with RemotePool(addresses) as pool:
+        assert _select(executor=pool, batch_size=2) == _select()
+        assert pool.n_workers == 3
+    assert len(shipped) == len(set(shipped)) <= 4 * 3
+
+
+def test_remote_reassigns_tasks_of_dead_workers(workers):
+    """
+    Check that the tasks of a worker which dies mid-iteration are
+    reassigned, and that tasks fail once every worker is lost.
+    """
+    processes, addresses = workers
+    expected = _select(model=_DyingRegression())
+    with RemotePool(addresses) as pool:
+        doomed = _DyingRegression(pid=processes[0].pid)
+        assert _select(model=doomed, executor=pool, batch_size=1) == expected
+        assert pool.n_workers == 2
+
+    with RemotePool(addresses[:1]) as pool:  # i.e., only the dead worker.
+        with pytest.raises(ConnectionError):
+            _select(executor=pool)
+
+
+def test_remote_fails_unpicklable_tasks(workers):
+    """
+    Check that a task which cannot be pickled fails its future,
+    and that the worker goes on to run later tasks.
+    """
+    _, addresses = workers
+    with RemotePool(addresses[:1]) as pool:
+        with pytest.raises((pickle.PicklingError, TypeError, AttributeError)):
+            pool.submit(lambda: 1).result(timeout=10)
+        assert pool.submit(len, (1, 2)).result(timeout=10) == 2
+        assert pool.n_workers == 1
+
+
+def test_remote_drops_released_arrays(workers, monkeypatch):
+    """
+    Check that workers drop the arrays which the coordinator released
+    (here, the subsamples of `halving`), so repeated runs do not
+    accumulate arrays on the workers or in the pool.
+    """
+    _, addresses = workers
+    held = collections.defaultdict(set)
+    send = remote._send
+
+    def tracking_send(sock, obj):
+        if obj[0] == 'data':
+            held[sock.getpeername()].add(obj[1])
+        elif obj[0] == 'drop':
+            held[sock.getpeername()].difference_update(obj[1])
+        send(sock, obj)
+
+    monkeypatch.setattr(remote, '_send', tracking_send)
+    with RemotePool(addresses) as pool:
+        sizes = list()
+        for _ in range(3):
+            _select(executor=pool, halving=10)
+            gc.collect()
+            sizes.append(max(len(tokens) for tokens in held.values()))
+        assert sizes[-1] <= sizes[0]
+        assert len(pool._tokens) == len(pool._live) <= sizes[0]
@@ -4,16 +4,28 @@
 Run Tests Common to Forward and Backward Selection
 ==================================================
 """
+import asyncio
+import gc
 import os
+import pickle
 import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
 
+import numpy as np
 import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import (LinearRegression, LogisticRegression,
+                                  SGDClassifier, SGDRegressor)
 
 sys.path.insert(0, os.path.abspath("."))
 sys.path.insert(0, os.path.abspath("../"))
 
 from pypunisher import Selection
+from pypunisher.selection_engines import _shared
+from pypunisher.selection_engines._screening import sure_independence_screen
 from tests._wrappers import forward, backward
 from pypunisher.example_data._example_data import true_best_features
 from tests._defaults import DEFAULT_SELECTION_PARAMS
@@ -205,3 +217,1025 @@ def test_fsel_verbose_output():
 def test_bsel_verbose_output():
     backward_output = backward(n_features=2, min_change=None, verbose=True)
     assert len(backward_output) >= 1
+
+
+# -----------------------------------------------------------------------------
+# Test parallel candidate evaluation
+# -----------------------------------------------------------------------------
+
+def test_invalid_n_jobs():
+    """
+    Check that `n_jobs` must be a non-zero int.
+    """
+    msg = "`n_jobs` must be a non-zero int."
+    for n_jobs in (0, 1.5, '2'):
+        with pytest.raises(ValueError, match=msg):
+            forward(n_jobs=n_jobs)
+
+
+def test_parallel_matches_serial():
+    """
+    Check that scoring candidates concurrently selects
+    exactly the same features as a serial run.
+    """
+    # Run until `min_change` stops forward selection, and eliminate down
+    # to a single feature, so that every iteration (and the stopping
+    # decision) is compared. The generic engine has the workers actually
+    # fit the candidates.
+    for backend in ('threading', 'loky'):
+        for criterion in (None, 'aic'):
+            kwargs = dict(criterion=criterion, engine='generic')
+            serial = forward(n_features=None, min_change=1e-4, **kwargs)
+            assert len(serial) > 2
+            assert serial == forward(n_features=None, min_change=1e-4,
+                                     n_jobs=2, backend=backend, **kwargs)
+            assert backward(n_features=1, **kwargs) == \
+                backward(n_features=1, n_jobs=2, backend=backend, **kwargs)
+
+
+class _CountingExecutor(object):
+    """A minimal executor which runs tasks inline."""
+
+    def __init__(self):
+        self.tasks = 0
+
+    def submit(self, fn, *args):
+        self.tasks += 1
+        result = fn(*args)
+        return type('Future', (), {'result': lambda self: result})()
+
+
+def test_executor_matches_serial():
+    """
+    Check that dispatching candidates through standard library
+    and user-supplied executors selects exactly the same features
+    as a serial run, with candidates batched into tasks.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS, engine='generic')
+    expected = (Selection(**d).forward(n_features=None, min_change=1e-4),
+                Selection(**d).backward(n_features=3))
+    with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as processes:
+        for executor in (threads, processes):
+            sel = Selection(**dict(d, executor=executor))
+            assert (sel.forward(n_features=None, min_change=1e-4),
+                    sel.backward(n_features=3)) == expected
+
+    executor = _CountingExecutor()
+    sel = Selection(**dict(d, executor=executor, batch_size=5))
+    sel.backward(n_features=19)
+    # The full model, then the 20 candidates in batches of 5.
+    assert executor.tasks == 1 + 4
+
+
+def test_invalid_executor():
+    """
+    Check that `executor` must have a submit method and
+    `batch_size` must be a positive int or None.
+    """
+    with pytest.raises(AttributeError):
+        forward(executor=object())
+    with pytest.raises(ValueError, match="`batch_size` must be"):
+        forward(executor=ThreadPoolExecutor(1), batch_size=0)
+
+
+# -----------------------------------------------------------------------------
+# Test shared data for worker processes
+# -----------------------------------------------------------------------------
+
+class _PicklingExecutor(_CountingExecutor):
+    """Runs tasks inline, but on pickled copies of their arguments
+    (as a process pool would), keeping the arguments for inspection."""
+
+    def __init__(self):
+        super(_PicklingExecutor, self).__init__()
+        self.args = list()
+
+    def submit(self, fn, *args):
+        self.args.append(args)
+        return super(_PicklingExecutor, self).submit(
+            fn, *pickle.loads(pickle.dumps(args))
+        )
+
+
+class _CrashingRegression(LinearRegression):
+    """Kills the (worker) process fitting it."""
+
+    def fit(self, X, y):
+        os._exit(1)
+
+
+def test_shared_data_sends_only_indices(tmp_path):
+    """
+    Check that, with shared data, tasks carry feature indices but no
+    arrays, that memory-mapped ``.npy`` inputs are shared by path,
+    and that the results are unchanged.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS, engine='generic')
+    expected = Selection(**d).backward(n_features=3)
+
+    executor = _PicklingExecutor()
+    sel = Selection(**dict(d, executor=executor, shared_data=True))
+    assert sel.backward(n_features=3) == expected
+    for args in executor.args:
+        assert not any(isinstance(a, np.ndarray) for a in args)
+    assert len(pickle.dumps(executor.args[0])) < 4096
+
+    path = str(tmp_path / "X_train.npy")
+    np.save(path, d['X_train'])
+    sel = Selection(**dict(d, X_train=path, executor=_PicklingExecutor(),
+                           shared_data=True))
+    assert sel.backward(n_features=3) == expected
+    assert sel._shared.paths[0] == path
+    sel.close()
+    assert os.path.exists(path)
+
+    # A raw ``np.memmap`` (here, Fortran-ordered, past a header) is
+    # shared in place too, rather than copied.
+    path = str(tmp_path / "X_train.dat")
+    X_train = np.asfortranarray(d['X_train'])
+    raw = np.memmap(path, dtype=X_train.dtype, mode='w+', offset=64,
+                    shape=X_train.shape, order='F')
+    raw[:] = X_train
+    raw.flush()
+    raw = np.memmap(path, dtype=X_train.dtype, mode='r', offset=64,
+                    shape=X_train.shape, order='F')
+    sel = Selection(**dict(d, X_train=raw, executor=_PicklingExecutor(),
+                           shared_data=True))
+    assert sel.backward(n_features=3) == expected
+    assert sel._shared.paths[0] == path
+    assert sorted(os.listdir(os.path.dirname(sel._shared.paths[1]))) == \
+        ['1.npy', '2.npy', '3.npy']
+    sel.close()
+
+
+def test_shared_data_attaches_to_latest_only():
+    """
+    Check that a (worker) process keeps only the latest shared arrays
+    open, so that those of closed instances are not kept mapped.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS, engine='generic', shared_data=True)
+    first = Selection(**dict(d, executor=_PicklingExecutor()))
+    first.backward(n_features=3)
+    second = Selection(**dict(d, executor=_PicklingExecutor()))
+    second.backward(n_features=3)
+    assert list(_shared._attached) == [second._shared._files]
+    first.close()
+    second.close()
+    assert not _shared._attached
+
+
+def test_shared_data_cleanup():
+    """
+    Check that the shared copy is written once for a process pool, and
+    removed by ``close()``, if a worker crashes and on garbage collection.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS, engine='generic')
+    with ProcessPoolExecutor(2) as executor:
+        sel = Selection(**dict(d, executor=executor))
+        assert sel.forward(n_features=None, min_change=1e-4) == \
+            Selection(**d).forward(n_features=None, min_change=1e-4)
+        directory = os.path.dirname(sel._shared.paths[0])
+        assert os.path.isdir(directory)
+        sel.close()
+        assert not os.path.exists(directory)
+
+        sel.backward(n_features=3)
+        directory = os.path.dirname(sel._shared.paths[0])
+        del sel
+        gc.collect()
+        assert not os.path.exists(directory)
+
+    with ProcessPoolExecutor(2) as executor:
+        sel = Selection(**dict(d, model=_CrashingRegression(), n_cpus=1,
+                               executor=executor))
+        with pytest.raises(BrokenProcessPool):
+            sel.forward(n_features=3)
+        directory = os.path.dirname(sel._shared.paths[0])
+        sel.close()
+        assert not os.path.exists(directory)
+
+
+# -----------------------------------------------------------------------------
+# Test the score cache
+# -----------------------------------------------------------------------------
+
+def test_invalid_cache_size():
+    """
+    Check that `cache_size` must be a positive int or None.
+    """
+    msg = "`cache_size` must be a positive int or None."
+    for cache_size in (0, 2.5):
+        with pytest.raises(ValueError, match=msg):
+            forward(cache_size=cache_size)
+
+
+def test_cache_shared_across_calls():
+    """
+    Check that the cache is shared by `forward()` and `backward()`
+    and does not change the selected features.
+    """
+    d = deepcopy(DEFAULT_SELECTION_PARAMS)
+    sel = Selection(**dict(d, engine='generic', cache_size=1000))
+    assert sel.cache_info() == (0, 0, 1000, 0)
+
+    # Full runs (to `min_change` and to a single feature) look up
+    # every candidate of every iteration, all of which a repeat
+    # run should find in the cache.
+    S = sel.forward(n_features=None, min_change=1e-4)
+    assert S == forward(n_features=None, min_change=1e-4, engine='generic')
+    hits, misses, _, _ = sel.cache_info()
+    assert misses > 20
+    assert sel.forward(n_features=None, min_change=1e-4) == S
+    assert sel.cache_info().hits == 2 * hits + misses
+    assert sel.cache_info().misses == misses
+
+    before = sum(sel.cache_info()[:2])
+    S = sel.backward(n_features=1)
+    assert S == backward(n_features=1, engine='generic')
+    hits, misses, _, _ = sel.cache_info()
+    lookups = hits + misses - before
+    assert sel.backward(n_features=1) == S
+    assert sel.cache_info().hits == hits + lookups
+    assert sel.cache_info().misses == misses
+    assert Selection(**d).cache_info() is None
+
+
+def test_cache_eviction():
+    """
+    Check that the cache never exceeds `cache_size`.
+    """
+    sel = Selection(**dict(deepcopy(DEFAULT_SELECTION_PARAMS), cache_size=5))
+    sel.forward(n_features=3)
+    assert sel.cache_info().currsize == 5
+
+
+def test_disk_cache_rerun_without_fits(tmp_path):
+    """
+    Check that a rerun on identical inputs is served entirely
+    from the cache file, and that changing the inputs does not
+    reuse stale scores.
+    """
+    d = dict(deepcopy(DEFAULT_SELECTION_PARAMS), engine='generic',
+             cache_file=str(tmp_path / "scores.bin"))
+    first = Selection(**d)
+    S_forward, S_backward = first.forward(n_features=3), first.backward(n_features=2)
+    assert first.cache_info().misses > 0
+
+    rerun = Selection(**deepcopy(d))
+    assert rerun.forward(n_features=3) == S_forward
+    assert rerun.backward(n_features=2) == S_backward
+    assert rerun.cache_info().misses == 0
+
+    other = Selection(**dict(deepcopy(d), criterion='aic'))
+    other.forward(n_features=3)
+    assert other.cache_info().hits == 0
+
+
+def test_disk_cache_ignores_partial_record(tmp_path):
+    """
+    Check that a truncated trailing record (e.g., from a
+    concurrent writer) is ignored by readers.
+    """
+    path = tmp_path / "scores.bin"
+    d = dict(deepcopy(DEFAULT_SELECTION_PARAMS), cache_file=str(path))
+    Selection(**d).forward(n_features=3)
+    with open(str(path), 'ab') as f:
+        f.write(b'\x00' * 7)
+    rerun = Selection(**deepcopy(d))
+    rerun.forward(n_features=3)
+    assert rerun.cache_info().misses == 0
+
+
+# -----------------------------------------------------------------------------
+# Test memory-mapped inputs
+# -----------------------------------------------------------------------------
+
+def test_npy_paths_are_memory_mapped(tmp_path):
+    """
+    Check that paths to `.npy` files are opened lazily as
+    `np.memmap`s and give the same selection as in-memory data.
+    """
+    d = deepcopy(DEFAULT_SELECTION_PARAMS)
+    for k in ('X_train', 'y_train', 'X_val', 'y_val'):
+        path = tmp_path / "{}.npy".format(k)
+        np.save(str(path), d[k])
+        d[k] = str(path)
+
+    for engine in ('auto', 'generic'):
+        sel = Selection(**dict(deepcopy(d), engine=engine))
+        assert isinstance(sel._X_train, np.memmap)
+        assert sel.forward(n_features=3) == forward(n_features=3, engine=engine)
+        assert sel.backward(n_features=2) == backward(n_features=2, engine=engine)
+        assert sel._buffer is None
+
+
+# -----------------------------------------------------------------------------
+# Test the forward selection shortlist
+# -----------------------------------------------------------------------------
+
+def test_invalid_shortlist():
+    """
+    Check that `shortlist` must be a positive int or None,
+    and requires a regressor (e.g., not string class labels).
+    """
+    msg = "`shortlist` must be a positive int or None."
+    for shortlist in (0, 0.5):
+        with pytest.raises(ValueError, match=msg):
+            forward(shortlist=shortlist)
+    d = DEFAULT_SELECTION_PARAMS
+    labels = np.array(['low', 'high'])
+    y_train = labels[(d['y_train'] > np.median(d['y_train'])).astype(int)]
+    y_val = labels[(d['y_val'] > np.median(d['y_val'])).astype(int)]
+    with pytest.raises(ValueError, match="`shortlist` requires a regressor."):
+        forward(model=LogisticRegression(), y_train=y_train, y_val=y_val,
+                shortlist=3)
+
+
+def test_shortlist_avoids_fits():
+    """
+    Check that shortlisting keeps the predictive features
+    while reporting the fits it avoided.
+    """
+    for engine in ('auto', 'generic'):
+        d = dict(deepcopy(DEFAULT_SELECTION_PARAMS), engine=engine, shortlist=3)
+        sel = Selection(**d)
+        S = sel.forward(n_features=None, min_change=1e-4)
+        assert sorted(S) == sorted(forward(n_features=None, min_change=1e-4))
+        assert sorted(S) == sorted(true_best_features)
+        # 20 + 19 + 18 + 17 candidates, of which 3 are scored per iteration.
+        assert sel.stats()['shortlist_skipped'] == 17 + 16 + 15 + 14
+
+
+# -----------------------------------------------------------------------------
+# Test sure independence screening
+# -----------------------------------------------------------------------------
+
+def test_invalid_prefilter():
+    """
+    Check that `prefilter` must be a positive int or None,
+    and that at least two features must survive it.
+    """
+    msg = "`prefilter` must be a positive int or None."
+    for prefilter in (0, 0.5):
+        with pytest.raises(ValueError, match=msg):
+            forward(prefilter=prefilter)
+    with pytest.raises(IndexError):
+        forward(prefilter=1)
+
+
+def test_prefilter_requires_a_regressor():
+    """
+    Check that screening rejects classifiers and non-numeric
+    responses (e.g., string class labels) with a clear error.
+    """
+    d = DEFAULT_SELECTION_PARAMS
+    labels = np.array(['low', 'high'])
+    y_train = labels[(d['y_train'] > np.median(d['y_train'])).astype(int)]
+    y_val = labels[(d['y_val'] > np.median(d['y_val'])).astype(int)]
+    with pytest.raises(ValueError, match="`prefilter` requires a regressor."):
+        forward(model=LogisticRegression(), y_train=y_train, y_val=y_val,
+                prefilter=5)
+    with pytest.raises(ValueError, match="requires a numeric `y`"):
+        sure_independence_screen(d['X_train'], y_train,
+                                 columns=list(range(20)), size=5)
+
+
+def test_prefilter_maps_to_original_columns(tmp_path):
+    """
+    Check that screening drops constant and duplicate columns, keeps
+    the most correlated columns and returns features in the column
+    numbering of `X_train`, on in-memory and memory-mapped data.
+    """
+    d = deepcopy(DEFAULT_SELECTION_PARAMS)
+    X_train, X_val = d['X_train'].copy(), d['X_val'].copy()
+    X_train[:, 2], X_val[:, 2] = X_train[:, 18], X_val[:, 18]  # duplicate
+    X_train[:, 5] = 4.  # constant, non-zero
+    path = tmp_path / "X_train.npy"
+    np.save(str(path), X_train)
+
+    for X in (X_train, str(path)):
+        sel = Selection(**dict(d, X_train=X, X_val=X_val, prefilter=2,
+                               engine='generic'))
+        dropped = sel.dropped_features()
+        assert dropped[18] == 'duplicate' and dropped[5] == 'constant'
+        assert sum(r == 'screened' for r in dropped.values()) == 1
+        assert sorted(sel.forward(n_features=None, min_change=1e-4)) in \
+            ([2, 7], [2, 13], [7, 13])
+        assert set(sel.backward(n_features=1)) < {2, 7, 13}
+
+
+
+def test_preflight_drops_redundant_columns(tmp_path):
+    """
+    Check that preflight excludes constant, duplicate and collinear
+    columns from the search space, keeping the first of each dependent
+    group, on in-memory and memory-mapped data.
+    """
+    rng = np.random.RandomState(3)
+    X_train, X_val = rng.normal(size=(150, 14)), rng.normal(size=(60, 14))
+    y_train = X_train[:, [0, 4, 10]].sum(axis=1) + rng.normal(size=150)
+    y_val = X_val[:, [0, 4, 10]].sum(axis=1) + rng.normal(size=60)
+    X_train[:, 5] = 4.  # constant
+    X_train[:, 9] = X_train[:, 3]  # duplicate
+    X_train[:, 12] = 2 * X_train[:, 0] - X_train[:, 1] + 7  # collinear
+    path = tmp_path / "X_train.npy"
+    np.save(str(path), X_train)
+
+    params = dict(DEFAULT_SELECTION_PARAMS, y_train=y_train, X_val=X_val,
+                  y_val=y_val, preflight=True)
+    for X in (X_train, str(path)):
+        sel = Selection(**dict(params, X_train=X))
+        assert sel.dropped_features() == {5: 'constant', 9: 'duplicate',
+                                          12: 'collinear'}
+        assert not {5, 9, 12} & set(sel.forward(n_features=10))
+        assert not {5, 9, 12} & set(sel.backward(n_features=3))
+
+    full_rank = Selection(**dict(params, X_train=rng.normal(size=(150, 14))))
+    assert full_rank.dropped_features() == dict()
+
+
+# -----------------------------------------------------------------------------
+# Test lazy greedy forward selection
+# -----------------------------------------------------------------------------
+
+
+def test_invalid_lazy():
+    """
+    Check that `lazy` must be a bool and cannot be combined with
+    `shortlist` or `racing`.
+    """
+    with pytest.raises(ValueError, match="`lazy` must be a bool."):
+        forward(lazy=1)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(lazy=True, shortlist=3)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(model=LinearRegression(), lazy=True, racing=0.99)
+
+
+def test_lazy_matches_exhaustive_if_gains_diminish():
+    """
+    Check that, with a score with diminishing gains (the size of the
+    union of sets, each feature covering one set), lazy evaluation selects
+    the features of the exhaustive search, in the same order, while
+    skipping evaluations.
+    """
+    rng = np.random.RandomState(11)
+    covers = [set(rng.choice(60, size=rng.randint(1, 20))) for _ in range(20)]
+
+    def coverage(self, S, candidates, algorithm):
+        return [len(set().union(*(covers[f] for f in S + [j])))
+                for j in candidates]
+
+    selected = dict()
+    for lazy in (False, True):
+        sel = Selection(**dict(DEFAULT_SELECTION_PARAMS, lazy=lazy))
+        sel._score_candidates = coverage.__get__(sel)
+        selected[lazy] = sel.forward(n_features=None, min_change=1)
+    assert selected[True] == selected[False]
+    assert sel.stats()['lazy_skipped'] > 0
+
+
+def test_lazy_on_example_data():
+    """
+    Check that lazy evaluation finds the predictive features.
+    """
+    assert sorted(forward(lazy=True)) == sorted(forward())
+
+
+# -----------------------------------------------------------------------------
+# Test successive halving
+# -----------------------------------------------------------------------------
+
+
+def test_invalid_halving():
+    """
+    Check that `halving` must be a positive int or None and
+    `halving_factor` a number greater than 1.
+    """
+    for halving in (0, 0.5):
+        with pytest.raises(ValueError, match="`halving` must be"):
+            forward(halving=halving)
+    for halving_factor in (1, '2'):
+        with pytest.raises(ValueError, match="`halving_factor` must be"):
+            forward(halving=10, halving_factor=halving_factor)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(lazy=True, halving=10)
+
+
+def test_halving_finds_predictive_features():
+    """
+    Check that successive halving selects the predictive features while
+    eliminating candidates before they are fitted on the full data, and
+    that it does nothing if the subsample would cover ``X_train``.
+    """
+    rng = np.random.RandomState(0)
+    X_train, X_val = rng.normal(size=(400, 12)), rng.normal(size=(200, 12))
+    beta = np.array([3, 0, 2, 0, 0, 1.5, 0, 0, 0, 2.5, 0, 0])
+    d = dict(DEFAULT_SELECTION_PARAMS, X_train=X_train, X_val=X_val,
+             y_train=X_train @ beta + rng.normal(size=400),
+             y_val=X_val @ beta + rng.normal(size=200), engine='generic')
+
+    for n_jobs in (1, 2):
+        sel = Selection(**dict(d, halving=20, n_jobs=n_jobs))
+        S = sel.forward(n_features=None, min_change=1e-3)
+        assert sorted(S[:4]) == [0, 2, 5, 9]
+        assert sel.backward(n_features=4) == [0, 2, 5, 9]
+        assert sel.stats()['halving_eliminated'] > 0
+
+    sel = Selection(**dict(d, halving=400))
+    sel.forward(n_features=None, min_change=1e-3)
+    assert 'halving_eliminated' not in sel.stats()
+
+
+def test_halving_stratifies_classes():
+    """
+    Check that the subsamples of successive halving hold every class,
+    so that a classifier can be fitted on them even if a class is rare.
+    """
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(1500, 8))
+    y = (4 * X[:, 1] - 4 * X[:, 4] + rng.logistic(size=1500) > 9).astype(int)
+    assert 0.03 < y.mean() < 0.1
+    d = dict(DEFAULT_SELECTION_PARAMS, model=LogisticRegression(),
+             X_train=X[:1000], y_train=y[:1000], X_val=X[1000:],
+             y_val=y[1000:])
+
+    sel = Selection(**dict(d, halving=20))
+    assert sel.backward(n_features=2) == [1, 4]
+    assert sel.stats()['halving_eliminated'] > 0
+
+
+def test_halving_ignored_by_linear_engine():
+    """
+    Check that the closed-form engines score every candidate.
+    """
+    sel = Selection(**dict(DEFAULT_SELECTION_PARAMS, halving=20))
+    assert sel.forward(n_features=None, min_change=1e-4) == \
+        forward(n_features=None, min_change=1e-4)
+    assert sel.stats() == dict()
+
+
+# -----------------------------------------------------------------------------
+# Test racing
+# -----------------------------------------------------------------------------
+
+
+def test_invalid_racing():
+    """
+    Check that `racing` must be a confidence level and requires a regressor.
+    """
+    for racing in (1, 0., 1.):
+        with pytest.raises(ValueError, match="`racing` must be"):
+            forward(racing=racing)
+    with pytest.raises(ValueError, match="requires a regressor"):
+        forward(model=LogisticRegression(), racing=0.99)
+
+
+@pytest.mark.parametrize("criterion", [None, 'aic', 'bic'])
+def test_racing_matches_exhaustive(criterion):
+    """
+    Check that racing rejects candidates early without
+    changing the selected features, under each criterion.
+    """
+    rng = np.random.RandomState(5)
+    X_train, X_val = rng.normal(size=(300, 10)), rng.normal(size=(5000, 10))
+    beta = np.array([2, 0, 0, 1, 0, 0, 0, .5, 0, 0])
+    d = dict(DEFAULT_SELECTION_PARAMS, X_train=X_train, X_val=X_val,
+             y_train=X_train @ beta + rng.normal(size=300),
+             y_val=X_val @ beta + rng.normal(size=5000),
+             engine='generic', criterion=criterion)
+
+    exhaustive = Selection(**d)
+    raced = Selection(**dict(d, racing=0.9999))
+    for n_features in (2, 4, 6):
+        assert raced.backward(n_features=n_features) == \
+            exhaustive.backward(n_features=n_features)
+    assert raced.forward(n_features=None, min_change=1e-4) == \
+        exhaustive.forward(n_features=None, min_change=1e-4)
+    assert raced.stats()['racing_rejected'] > 0
+
+
+# -----------------------------------------------------------------------------
+# Test speculation
+# -----------------------------------------------------------------------------
+
+
+class _InlineFutureExecutor(object):
+    """Runs tasks inline, returning ``concurrent.futures.Future``s."""
+
+    n_workers = 2
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_invalid_speculate():
+    """
+    Check that `speculate` must be a positive int or None,
+    and cannot be combined with `lazy` or `racing`.
+    """
+    for speculate in (0, 1.5):
+        with pytest.raises(ValueError, match="`speculate` must be"):
+            forward(speculate=speculate)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(speculate=2, lazy=True)
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(speculate=2, racing=0.99)
+
+
+def test_speculation_matches_sequential():
+    """
+    Check that speculating on the next iteration selects exactly the
+    features of a sequential run, and that work for the right leader
+    is reused.
+    """
+    rng = np.random.RandomState(1)
+    X_train, X_val = rng.normal(size=(200, 8)), rng.normal(size=(100, 8))
+    beta = np.array([0, 2, 0, 1, 0, 0, 3, 0])
+    d = dict(DEFAULT_SELECTION_PARAMS, X_train=X_train, X_val=X_val,
+             y_train=X_train @ beta + rng.normal(size=200),
+             y_val=X_val @ beta + rng.normal(size=100), engine='generic')
+    expected = Selection(**d).forward(n_features=None, min_change=1e-3)
+
+    # Every candidate finishes at once, so the leaders are always the
+    # best candidates: each iteration after the first is a full hit.
+    sel = Selection(**dict(d, executor=_InlineFutureExecutor(), speculate=2))
+    S = sel.forward(n_features=None, min_change=1e-3)
+    assert S == expected
+    assert sel.stats()['speculation_hits'] == sum(
+        8 - i for i in range(1, len(S) + 1)
+    )
+    assert sel.stats()['speculation_wasted'] > 0
+
+    for kwargs in (dict(n_jobs=2, backend='threading'),
+                   dict(executor=ThreadPoolExecutor(3))):
+        sel = Selection(**dict(d, speculate=3, **kwargs))
+        assert sel.forward(n_features=None, min_change=1e-3) == expected
+        assert sel._speculation_pool is None
+
+
+# -----------------------------------------------------------------------------
+# Test the asyncio API
+# -----------------------------------------------------------------------------
+
+
+class _SlowRegression(LinearRegression):
+    """Counts its fits, each of which takes a while."""
+
+    fits = 0
+
+    def fit(self, X, y):
+        type(self).fits += 1
+        time.sleep(0.02)
+        return super(_SlowRegression, self).fit(X, y)
+
+
+def test_async_matches_sync_with_shared_pool():
+    """
+    Check that concurrent async selections sharing one executor select
+    exactly the features of the synchronous methods, without blocking
+    the event loop.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS, engine='generic')
+    expected = (Selection(**d).forward(n_features=None, min_change=1e-4),
+                Selection(**d).backward(n_features=3))
+
+    async def main(executor):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        jobs = list()
+        for _ in range(3):
+            sel = Selection(**dict(d, executor=executor))
+            jobs.append(sel.forward_async(n_features=None, min_change=1e-4))
+            jobs.append(Selection(**dict(d, executor=executor))
+                        .backward_async(n_features=3))
+        results = await asyncio.gather(*jobs)
+        ticker.cancel()
+        return results, ticks
+
+    with ThreadPoolExecutor(2) as executor:
+        results, ticks = asyncio.run(main(executor))
+    assert results == list(expected) * 3
+    assert ticks > 0
+
+
+class _LingeringRegression(LinearRegression):
+    """Lingers between fitting and scoring, so that concurrent fits of
+    the same instance would overwrite its coefficients meanwhile."""
+
+    def fit(self, X, y):
+        super(_LingeringRegression, self).fit(X, y)
+        time.sleep(0.002)
+        return self
+
+
+def test_async_runs_sharing_a_model():
+    """
+    Check that concurrent async selections whose instances share one
+    model, and no executor, each fit a model of their own.
+    """
+    model = _LingeringRegression()
+    d = dict(DEFAULT_SELECTION_PARAMS, model=model, engine='generic', n_cpus=1)
+    expected = (Selection(**d).forward(n_features=None, min_change=1e-4),
+                Selection(**d).backward(n_features=3))
+
+    async def main():
+        return await asyncio.gather(
+            Selection(**d).forward_async(n_features=None, min_change=1e-4),
+            Selection(**d).backward_async(n_features=3)
+        )
+
+    assert tuple(asyncio.run(main())) == expected
+
+
+@pytest.mark.parametrize("use_executor", [False, True])
+def test_async_cancellation(use_executor):
+    """
+    Check that cancelling an async selection stops it mid-iteration,
+    that no fits run once the call has returned, and that the instance
+    may then be used again.
+    """
+    _SlowRegression.fits = 0
+    d = dict(DEFAULT_SELECTION_PARAMS, model=_SlowRegression(),
+             engine='generic', n_cpus=1)
+
+    async def main(sel):
+        task = asyncio.ensure_future(sel.forward_async(n_features=3))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        fits = _SlowRegression.fits
+        await asyncio.sleep(0.1)
+        assert _SlowRegression.fits == fits
+        return fits
+
+    with ThreadPoolExecutor(1) as executor:
+        sel = Selection(**dict(d, executor=executor if use_executor else None,
+                               batch_size=1))
+        assert asyncio.run(main(sel)) < 20  # i.e., within the 1st iteration.
+        assert asyncio.run(sel.backward_async(n_features=19)) == \
+            sel.backward(n_features=19)
+
+
+# -----------------------------------------------------------------------------
+# Test the step-by-step API
+# -----------------------------------------------------------------------------
+
+
+def test_steps_match_selection():
+    """
+    Check that the steps yielded add (or drop) exactly
+    the features selected by ``forward()`` and ``backward()``.
+    """
+    for engine in ('auto', 'generic'):
+        sel = Selection(**dict(DEFAULT_SELECTION_PARAMS, engine=engine))
+        steps = list(sel.forward_steps(n_features=None, min_change=1e-4))
+        assert [s.feature for s in steps] == \
+            sel.forward(n_features=None, min_change=1e-4)
+        assert [s.elapsed for s in steps] == sorted(s.elapsed for s in steps)
+
+        steps = list(sel.backward_steps(n_features=3))
+        assert len(steps) == 17
+        assert sorted(set(range(20)) - {s.feature for s in steps}) == \
+            sorted(sel.backward(n_features=3))
+
+    with pytest.raises(TypeError):
+        sel.forward_steps(n_features=2, min_change=1e-4)
+
+
+def test_abandoned_steps_release_workers():
+    """
+    Check that abandoning the generator cancels speculative
+    work and removes the shared copy of the data at once.
+    """
+    sel = Selection(**dict(DEFAULT_SELECTION_PARAMS, engine='generic',
+                           executor=_InlineFutureExecutor(), speculate=2,
+                           shared_data=True))
+    for step in sel.forward_steps(n_features=None, min_change=1e-4):
+        directory = os.path.dirname(sel._shared.paths[0])
+        assert sel._speculator is not None
+        break
+    assert step.feature == forward(n_features=None, min_change=1e-4)[0]
+    assert sel._speculator is None and sel._shared is None
+    assert not os.path.exists(directory)
+    assert sel.stats()['speculation_wasted'] > 0
+
+
+# -----------------------------------------------------------------------------
+# Test selection under several criteria
+# -----------------------------------------------------------------------------
+
+
+class _CountingRegression(LinearRegression):
+    """Counts its fits (and predictions)."""
+
+    fits = predictions = 0
+
+    def fit(self, X, y):
+        type(self).fits += 1
+        return super(_CountingRegression, self).fit(X, y)
+
+    def predict(self, X):
+        type(self).predictions += 1
+        return super(_CountingRegression, self).predict(X)
+
+
+def test_all_criteria_from_one_fit():
+    """
+    Check that selecting under several criteria at once matches separate
+    runs, while fitting each candidate and predicting with it only once.
+    """
+    rng = np.random.RandomState(2)
+    X_train, X_val = rng.normal(size=(200, 8)), rng.normal(size=(100, 8))
+    beta = np.array([1, 0, 0, .3, 0, 2, 0, .1])
+    d = dict(DEFAULT_SELECTION_PARAMS, X_train=X_train, X_val=X_val,
+             y_train=X_train @ beta + rng.normal(size=200),
+             y_val=X_val @ beta + rng.normal(size=100),
+             model=_CountingRegression(), engine='generic')
+    criteria = (None, 'aic', 'bic')
+
+    _CountingRegression.fits = 0
+    expected = {c: (Selection(**dict(d, criterion=c)).forward(n_features=None,
+                                                              min_change=1e-4),
+                    Selection(**dict(d, criterion=c)).backward(n_features=2))
+                for c in criteria}
+    separate = _CountingRegression.fits
+
+    _CountingRegression.fits = _CountingRegression.predictions = 0
+    sel = Selection(**d)
+    forward_all = sel.forward_all(n_features=None, min_change=1e-4)
+    backward_all = sel.backward_all(criteria, n_features=2)
+    assert {c: (forward_all[c], backward_all[c]) for c in criteria} == expected
+    assert _CountingRegression.predictions == _CountingRegression.fits
+    assert _CountingRegression.fits < separate
+
+    # The settings of the instance are restored.
+    assert sel._criterion is None and sel.cache_info() is None
+
+    for engine in ('auto', 'generic'):
+        sel = Selection(**dict(DEFAULT_SELECTION_PARAMS, engine=engine))
+        assert sel.backward_all(('bic', None), n_features=3) == {
+            c: backward(n_features=3, criterion=c) for c in ('bic', None)
+        }
+
+
+def test_invalid_criteria():
+    """
+    Check that `criteria` must be distinct valid criteria.
+    """
+    sel = Selection(**DEFAULT_SELECTION_PARAMS)
+    for criteria in ((), ('aic', 'aic'), ('r2',)):
+        with pytest.raises(ValueError, match="`criteria` must be"):
+            sel.forward_all(criteria, n_features=3)
+
+
+# -----------------------------------------------------------------------------
+# Test warm starts
+# -----------------------------------------------------------------------------
+
+
+class _IterationCountingLogistic(LogisticRegression):
+    """Records the iterations of each fit."""
+
+    iterations = list()
+
+    def fit(self, X, y):
+        super(_IterationCountingLogistic, self).fit(X, y)
+        type(self).iterations.append(int(self.n_iter_.max()))
+        return self
+
+
+def test_invalid_warm_start():
+    """
+    Check that `warm_start` must be a bool, requires a model declaring
+    ``warm_start`` and cannot be combined with `speculate`.
+    """
+    with pytest.raises(ValueError, match="`warm_start` must be"):
+        forward(warm_start=1)
+    with pytest.raises(ValueError, match="requires a model"):
+        forward(warm_start=True)  # i.e., LinearRegression.
+    with pytest.raises(ValueError, match="cannot be combined"):
+        forward(model=LogisticRegression(), warm_start=True, speculate=2)
+
+
+def test_warm_start_cuts_iterations():
+    """
+    Check that starting candidates from the current model's coefficients
+    selects the same features in fewer solver iterations, serially and
+    in parallel, without modifying the model passed in.
+    """
+    rng = np.random.RandomState(0)
+    scale = rng.uniform(1, 10, size=15)
+    X = rng.normal(size=(2000, 15)) * scale + rng.uniform(-5, 5, size=15)
+    beta = np.zeros(15)
+    beta[[1, 4, 6]] = [.3, -.2, .1]
+    y = (X @ beta + rng.logistic(size=2000) > 0).astype(int)
+    model = _IterationCountingLogistic(max_iter=10000)
+    d = dict(DEFAULT_SELECTION_PARAMS, model=model, X_train=X[:1300],
+             y_train=y[:1300], X_val=X[1300:], y_val=y[1300:], n_cpus=1)
+
+    iterations = dict()
+    for warm_start in (False, True):
+        del _IterationCountingLogistic.iterations[:]
+        S = Selection(**dict(d, warm_start=warm_start)).forward(
+            n_features=None, min_change=0.1
+        )
+        iterations[warm_start] = sum(_IterationCountingLogistic.iterations)
+        if warm_start:
+            assert S == expected
+        expected = S
+    assert iterations[True] < 0.85 * iterations[False]
+    assert model.warm_start is False
+
+    with ThreadPoolExecutor(2) as executor:
+        for kwargs in (dict(n_jobs=2, backend='threading'),
+                       dict(executor=executor)):
+            sel = Selection(**dict(d, warm_start=True, **kwargs))
+            assert sel.forward(n_features=None, min_change=0.1) == expected
+
+
+def test_warm_start_backward():
+    """
+    Check that warm starts also cut the iterations of backward selection,
+    whose large candidates are fitted on views of the column buffer, and
+    select the same features.
+    """
+    rng = np.random.RandomState(0)
+    scale = rng.uniform(1, 10, size=12)
+    X = rng.normal(size=(2000, 12)) * scale + rng.uniform(-5, 5, size=12)
+    beta = np.zeros(12)
+    beta[[1, 4, 6]] = [.3, -.2, .1]
+    y = (X @ beta + rng.logistic(size=2000) > 0).astype(int)
+    d = dict(DEFAULT_SELECTION_PARAMS, X_train=X[:1300], y_train=y[:1300],
+             X_val=X[1300:], y_val=y[1300:], n_cpus=1)
+
+    iterations = dict()
+    for warm_start in (False, True):
+        del _IterationCountingLogistic.iterations[:]
+        model = _IterationCountingLogistic(solver='saga', max_iter=10000)
+        S = Selection(**dict(d, model=model, warm_start=warm_start)).backward(
+            n_features=3
+        )
+        iterations[warm_start] = sum(_IterationCountingLogistic.iterations)
+        assert S == [1, 4, 6]
+    assert iterations[True] < 0.85 * iterations[False]
+
+
+class _InitRecordingSGDRegressor(SGDRegressor):
+    """Records the keyword arguments of each fit."""
+
+    kwargs = list()
+
+    def fit(self, X, y, **kwargs):
+        type(self).kwargs.append(sorted(kwargs))
+        return super(_InitRecordingSGDRegressor, self).fit(X, y, **kwargs)
+
+
+@pytest.mark.parametrize("model", [
+    _InitRecordingSGDRegressor(random_state=0),
+    _InitRecordingSGDRegressor(average=True, random_state=0),
+    SGDClassifier(average=True, random_state=0)
+])
+def test_warm_start_sgd(model):
+    """
+    Check that SGD estimators, whose state holds more than their
+    coefficients (e.g., the averages of ``average=True``), start
+    from the coefficients passed to ``fit()``.
+    """
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(1000, 8))
+    y = X @ np.array([3, 0, 2, 0, 1, 0, 0, 0]) + rng.normal(size=1000)
+    if isinstance(model, SGDClassifier):
+        y = (y > 0).astype(int)
+    d = dict(DEFAULT_SELECTION_PARAMS, model=model, X_train=X[:600],
+             y_train=y[:600], X_val=X[600:], y_val=y[600:])
+
+    del _InitRecordingSGDRegressor.kwargs[:]
+    sel = Selection(**dict(d, warm_start=True))
+    assert sel.backward(n_features=3) == [0, 2, 4]
+    assert len(sel.forward(n_features=None, min_change=1e-3)) >= 3
+    if isinstance(model, _InitRecordingSGDRegressor):
+        assert ['coef_init', 'intercept_init'] in model.kwargs
+    assert not model.warm_start
+
+
+def test_warm_start_without_coefficients():
+    """
+    Check that models without coefficients are fitted from scratch.
+    """
+    d = dict(DEFAULT_SELECTION_PARAMS,
+             model=RandomForestRegressor(n_estimators=3, random_state=0))
+    sel = Selection(**dict(d, warm_start=True))
+    assert sel.backward(n_features=17) == \
+        Selection(**d).backward(n_features=17)
+    assert sel._warm_start is False